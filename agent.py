@@ -1,5 +1,10 @@
+from bitboard import BitBoard
+from distancefield import FieldSearch, GridWalls
 from gameobjects import GameObject
-from move import Move, Direction
+from move import Move, moves_by_step
+import functools
+import heapq
+import itertools
 import time
 
 # This is the class which will hold a potential state the astar algo considers
@@ -29,10 +34,10 @@ class Node:
 
 
 def copy_board(board):
-    copy = [[GameObject.EMPTY for x in range(
-        len(board))] for y in range(len(board))]
+    copy = [[GameObject.EMPTY for y in range(
+        len(board[0]))] for x in range(len(board))]
     for x in range(len(board)):
-        for y in range(len(board)):
+        for y in range(len(board[0])):
             copy[x][y] = board[x][y] if board[x][y] is not GameObject.SNAKE_HEAD else GameObject.SNAKE_BODY
     return copy
 
@@ -59,17 +64,46 @@ def heuristic(start_node, end_node, score):
         start_node.position[0] - end_node.position[0]) + abs(start_node.position[1] - end_node.position[1])) ** 0.5
 
 
-def astar(head_position, board, score, snake_body):
-    # initialize our variables
-    openSet = []  # open list, list of states we're considering
-    closedSet = []  # closed list, list of states we're discarding
-    startNode = Node(None, head_position, snake_body.copy(),
-                     copy_board(board))  # initial state to find path to food from
+# method that returns the heuristic function for a search towards the end node, which takes a position. The heuristic
+# is the exact number of steps around the walls. The snake can only make the way longer, so it never overestimates.
+# Cells from which the end node can not be reached get -1. A board which keeps distance fields gives a cached field,
+# for a copied board the field is built here, so agents get the same paths whichever kind of board they are given.
+# Building a field takes time in the area of the board, so with a deadline at most half of the time left is spent on
+# it. When the field is not done by then, the manhattan distance is used, which is a lower bound as well. A board
+# which keeps distance fields continues building the field during the next search
+
+
+def make_heuristic(board, endNode, score, deadline=None):
+    height = len(board[0])
+    target = endNode.position
+    fieldDeadline = None if deadline is None else (time.perf_counter() + deadline) / 2
+    if hasattr(board, "get_distance_field"):
+        distanceField = board.get_distance_field(target, fieldDeadline)
+    else:
+        search = FieldSearch(len(board), height, GridWalls(board), [target])
+        distanceField = search.distances if search.run(fieldDeadline) else None
+    if distanceField is None:
+        return lambda position: abs(position[0] - target[0]) + abs(position[1] - target[1])
+    return lambda position: distanceField[position[0] * height + position[1]]
+
+
+def find_end_node(startNode, board, score):
+    # the view on the live board keeps an index of the food, which gives the same food as the scan below without
+    # visiting every cell
+    if hasattr(board, "get_nearest_food"):
+        x, y = startNode.position
+        endPos = board.get_nearest_food(x, y) if score < 50 else board.get_farthest_food(x, y)
+        if endPos is None:
+            return None
+        endNode = Node(None, None, None, None)
+        endNode.position = endPos
+        return endNode
+
     endNodes = []  # all possible food objects
 
     # find the goal positions. make a new node for each goal node
     for x in range(len(board)):
-        for y in range(len(board)):
+        for y in range(len(board[0])):
             if board[x][y] == GameObject.FOOD:
                 # found it!
                 endPos = (x, y)
@@ -77,6 +111,9 @@ def astar(head_position, board, score, snake_body):
                 newEndNode.position = endPos
                 endNodes.append(newEndNode)
 
+    if len(endNodes) == 0:
+        return None
+
     # find closest food object
     if score < 50:
         minHeuristic = heuristic(startNode, endNodes[0], score)
@@ -97,12 +134,98 @@ def astar(head_position, board, score, snake_body):
                 maxHeuristic = thisNodeHeuristic
                 endNode = node
 
+    return endNode
+
+# method that creates the state of the snake after moving from the current state to a neighboring position
+
+
+def make_neighbor_node(current, neighborPos):
+    # make a new node object for this state!
+    boardState = copy_board(current.board)
+    tempSnakeState = current.snake_body.copy()
+
+    # our new state needs an updated snake body and board state
+    # if our snake body list is not empty (snake has more than just head)
+
+    if (len(tempSnakeState) > 1):
+        # update the board state in this node as if the snake has just moved,
+        # so set the old tail position in board to empty
+
+        snakeTail = tempSnakeState[len(tempSnakeState) - 1]
+        boardState[snakeTail[0]
+                   ][snakeTail[1]] = GameObject.EMPTY
+    # our head has moved, so where the head was is now part of the body
+    tempSnakeState.insert(0, current.position)
+
+    # the position we're moving to is now the snake head in the board
+    boardState[neighborPos[0]
+               ][neighborPos[1]] = GameObject.SNAKE_HEAD
+
+    if (len(tempSnakeState) > 1):
+        # if the snake has a body, our old position we're moving from is now the snake body
+        boardState[current.position[0]
+                   ][current.position[1]] = GameObject.SNAKE_BODY
+    else:
+        # snake is just head, set old position to empty
+        boardState[current.position[0]
+                   ][current.position[1]] = GameObject.EMPTY
+
+    return Node(current, neighborPos, tempSnakeState, boardState)
+
+
+# method that returns the positions from the start node up to the given node
+
+
+def reconstruct_path(node):
+    path = []
+    while node is not None:
+        path.append(node.position)
+        node = node.parent
+    return path[::-1]  # Return reversed path
+
+# method that returns the path to the expanded node closest to the goal, used when the search runs out of time. When
+# no progress towards the goal was made at all, there is no useful partial path
+
+
+def partial_path(bestNode):
+    if bestNode is None or bestNode.parent is None:
+        return None
+    return reconstruct_path(bestNode)
+
+# number of expanded nodes between two checks of the deadline in the heap and IDA* planners, checking the clock on
+# every expansion is too expensive there. The list planner copies the board for every neighbor, which takes far longer
+# than checking the clock, so it checks the deadline on every expansion
+deadline_check_interval = 64
+
+
+def astar(head_position, board, score, snake_body, stats=None, deadline=None, growth=0):
+    # the growth is not needed here: the copied boards only release the tail after the first step, which is when it
+    # leaves after eating, and keep all other body parts in place
+    # initialize our variables
+    openSet = []  # open list, list of states we're considering
+    closedSet = []  # closed list, list of states we're discarding
+    startNode = Node(None, head_position, snake_body.copy(),
+                     copy_board(board))  # initial state to find path to food from
+
+    endNode = find_end_node(startNode, board, score)
+    if endNode is None:
+        return None
+
     # our start node needs a cost
-    startNode.h = heuristic(startNode, endNode, score)
+    positionHeuristic = make_heuristic(board, endNode, score, deadline)
+    startNode.h = positionHeuristic(startNode.position)
+    if startNode.h < 0:
+        # the walls separate the head from the food. All cells next to a reachable cell are reachable as well, so no
+        # other node gets -1
+        return None
     startNode.f = startNode.h
+    # copying the board and building the heuristic take a while on large boards
+    if deadline is not None and time.perf_counter() >= deadline:
+        return None
 
     # start the open set with the start node
     openSet.append(startNode)
+    bestNode = startNode  # expanded node closest to the goal
 
     while len(openSet) > 0:
         # we can keep going!
@@ -111,14 +234,16 @@ def astar(head_position, board, score, snake_body):
 
         # we're done! return the path we need to take...
         if current.position == endNode.position:
-            path = []
-            while current is not None:
-                path.append(current.position)
-                current = current.parent
-            return path[::-1]  # Return reversed path
+            return reconstruct_path(current)
 
         openSet.remove(current)
         closedSet.append(current)
+        if stats is not None:
+            stats["expanded"] += 1
+        if current.h < bestNode.h:
+            bestNode = current
+        if deadline is not None and time.perf_counter() >= deadline:
+            return partial_path(bestNode)
 
         # generate neighbors of the current state we're considering
         # these are offsets for the position in the board forward,
@@ -132,40 +257,7 @@ def astar(head_position, board, score, snake_body):
             if (neighborPos[0] < (len(board)) and neighborPos[0] >= 0 and neighborPos[1] < (len(board[len(board)-1])) and neighborPos[1] >= 0):
                  # can the snake safely move to this state without dying? (is it empty/food object?)
                 if current.board[neighborPos[0]][neighborPos[1]] == GameObject.EMPTY or current.board[neighborPos[0]][neighborPos[1]] == GameObject.FOOD:
-                     # make a new node object for this state!
-                    boardState = copy_board(current.board)
-                    tempSnakeState = current.snake_body.copy()
-
-                    # our new state needs an updated snake body and board state
-                    # if our snake body list is not empty (snake has more than just head)
-
-                    if (len(tempSnakeState) > 1):
-                        # update the board state in this node as if the snake has just moved,
-                        # so set the old tail position in board to empty
-
-                        snakeTail = tempSnakeState[len(tempSnakeState) - 1]
-                        boardState[snakeTail[0]
-                                   ][snakeTail[1]] = GameObject.EMPTY
-                     # our head has moved, so where the head was is now part of the body
-                    tempSnakeState.insert(0, current.position)
-
-                    # the position we're moving to is now the snake head in the board
-                    boardState[neighborPos[0]
-                               ][neighborPos[1]] = GameObject.SNAKE_HEAD
-
-                    if (len(tempSnakeState) > 1):
-                        # if the snake has a body, our old position we're moving from is now the snake body
-                        boardState[current.position[0]
-                                   ][current.position[1]] = GameObject.SNAKE_BODY
-                    else:
-                        # snake is just head, set old position to empty
-                        boardState[current.position[0]
-                                   ][current.position[1]] = GameObject.EMPTY
-
-                    tempSnakeState = tempSnakeState[::1]
-                    neighborNode = Node(
-                        current, neighborPos, tempSnakeState, boardState)
-                    current.neighbors.append(neighborNode)
+                    current.neighbors.append(make_neighbor_node(current, neighborPos))
 
         for neighbor in current.neighbors:
             # do we need to evaluate this neighbor?
@@ -179,66 +271,277 @@ def astar(head_position, board, score, snake_body):
                 else:
                     neighbor.g = tentativeG
                     openSet.append(neighbor)
-                neighbor.h = heuristic(neighbor, endNode, score)
+                neighbor.h = positionHeuristic(neighbor.position)
                 neighbor.f = neighbor.g + neighbor.h
                 neighbor.parent = current
 
 
+# method that builds a table with the number of steps after which each body part has moved out of its cell. The body
+# part directly following the head is the last one to leave, the tail leaves after the first step. The growth is the
+# number of parts the body still grows by: right after eating the tail stays in place during the next step, so every
+# part leaves one step later. The head can not turn around, so the part directly following it is never entered during
+# the first step, not even when it is the tail as well
+
+
+def build_freed_at(snake_body, growth=0):
+    freedAt = {}
+    for i, part in enumerate(snake_body):
+        freedAt[part] = len(snake_body) - i + growth
+    if snake_body:
+        freedAt[snake_body[0]] = max(freedAt[snake_body[0]], 2)
+    return freedAt
+
+# A* with a binary heap as open set. Instead of removing nodes from the heap when a better path to their position is
+# found, a new entry is pushed and the old entry is skipped once it is popped (lazy deletion). The best g value and
+# the closed set are indexed by position, so each expansion costs O(log n) instead of O(n).
+# The nodes do not hold a copy of the board or the body. The given board is shared by all nodes and a body cell is
+# considered passable once the snake has taken enough steps for the tail to have moved past it.
+# When a deadline (a time.perf_counter() value) is given and passes, the path to the expanded node closest to the
+# goal is returned instead. Both planners behave this way.
+
+
+def astar_heap(head_position, board, score, snake_body, stats=None, deadline=None, growth=0):
+    startNode = Node(None, head_position, None, None)  # initial state to find path to food from
+
+    endNode = find_end_node(startNode, board, score)
+    if endNode is None:
+        return None
+
+    positionHeuristic = make_heuristic(board, endNode, score, deadline)
+    startNode.h = positionHeuristic(startNode.position)
+    if startNode.h < 0:
+        # the walls separate the head from the food
+        return None
+    startNode.f = startNode.h
+
+    width = len(board)
+    height = len(board[0])
+    # the counter breaks ties between equal f values, so nodes themselves never have to be compared
+    counter = itertools.count()
+    openHeap = [(startNode.f, next(counter), startNode)]
+    bestG = {head_position: 0}  # lowest g value found so far per position
+    closedSet = set()  # positions that have been expanded
+    freedAt = build_freed_at(snake_body, growth)  # step at which each body cell becomes passable
+    bestNode = startNode  # expanded node closest to the goal
+    expanded = 0
+
+    while openHeap:
+        current = heapq.heappop(openHeap)[2]
+        if current.position in closedSet:
+            # stale entry, this position was already expanded through a better path
+            continue
+
+        if current.position == endNode.position:
+            return reconstruct_path(current)
+
+        closedSet.add(current.position)
+        if stats is not None:
+            stats["expanded"] += 1
+        if current.h < bestNode.h:
+            bestNode = current
+        expanded += 1
+        if deadline is not None and expanded % deadline_check_interval == 0 and time.perf_counter() >= deadline:
+            return partial_path(bestNode)
+
+        for neighborOffset in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
+            neighborPos = (
+                current.position[0] + neighborOffset[0], current.position[1] + neighborOffset[1])
+            if not (0 <= neighborPos[0] < width and 0 <= neighborPos[1] < height):
+                continue
+            if neighborPos in closedSet:
+                continue
+            tentativeG = current.g + 1
+            gameObject = board[neighborPos[0]][neighborPos[1]]
+            if gameObject == GameObject.SNAKE_BODY:
+                # the body part needs to have moved away before the head arrives
+                if tentativeG < freedAt.get(neighborPos, tentativeG + 1):
+                    continue
+            elif not (gameObject == GameObject.EMPTY or gameObject == GameObject.FOOD):
+                continue
+
+            if tentativeG < bestG.get(neighborPos, tentativeG + 1):
+                bestG[neighborPos] = tentativeG
+                neighbor = Node(current, neighborPos, None, None)
+                neighbor.g = tentativeG
+                neighbor.h = positionHeuristic(neighbor.position)
+                neighbor.f = neighbor.g + neighbor.h
+                heapq.heappush(openHeap, (neighbor.f, next(counter), neighbor))
+
+
+# maximum number of positions the memory-bounded planner remembers during an iteration
+ida_max_nodes = 100000
+
+# Iterative deepening A*: a depth first search that only follows paths whose f value stays within a bound, repeated
+# with the smallest f value that exceeded the bound until the food is reached. Only the current path and the untried
+# neighbors along it are kept, plus a table with the lowest g value per position that holds at most max_nodes
+# positions. Once the table is full, positions are searched again instead of being remembered, so a smaller table
+# costs time but never memory. Body cells are passable once freed and the lowest g value decides, like in astar_heap.
+# On large boards a time budget is advised, proving that no path exists takes many iterations.
+
+
+def astar_ida(head_position, board, score, snake_body, stats=None, deadline=None, growth=0, max_nodes=None):
+    if max_nodes is None:
+        max_nodes = ida_max_nodes
+    startNode = Node(None, head_position, None, None)
+
+    endNode = find_end_node(startNode, board, score)
+    if endNode is None:
+        return None
+
+    positionHeuristic = make_heuristic(board, endNode, score, deadline)
+    startH = positionHeuristic(head_position)
+    if startH < 0:
+        # the walls separate the head from the food
+        return None
+
+    width = len(board)
+    height = len(board[0])
+    freedAt = build_freed_at(snake_body, growth)  # step at which each body cell becomes passable
+    goal = endNode.position
+
+    def children(position, g, onPath):
+        # the neighbors that can be entered at step g, sorted so the one with the lowest f is popped first
+        result = []
+        for neighborOffset in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
+            neighborPos = (position[0] + neighborOffset[0], position[1] + neighborOffset[1])
+            if not (0 <= neighborPos[0] < width and 0 <= neighborPos[1] < height) or neighborPos in onPath:
+                continue
+            gameObject = board[neighborPos[0]][neighborPos[1]]
+            if gameObject == GameObject.SNAKE_BODY:
+                if g < freedAt.get(neighborPos, g + 1):
+                    continue
+            elif not (gameObject == GameObject.EMPTY or gameObject == GameObject.FOOD):
+                continue
+            h = positionHeuristic(neighborPos)
+            result.append((g + h, h, neighborPos))
+        result.sort(reverse=True)
+        return result
+
+    bound = startH
+    bestH = startH
+    bestPath = None  # path to the position closest to the goal
+    expanded = 0
+    # the longest path without loops visits every cell once
+    while bound <= width * height:
+        nextBound = None
+        bestG = {}  # lowest g value per position in this iteration, holds at most max_nodes positions
+        path = [head_position]
+        onPath = {head_position}
+        # stack[i] holds the untried neighbors of path[i]
+        stack = [children(head_position, 1, onPath)]
+        while stack:
+            if not stack[-1]:
+                stack.pop()
+                onPath.discard(path.pop())
+                continue
+            f, h, position = stack[-1].pop()
+            if f > bound:
+                if nextBound is None or f < nextBound:
+                    nextBound = f
+                continue
+            if position == goal:
+                return path + [position]
+            g = len(path)
+            if bestG.get(position, g + 1) <= g:
+                continue
+            if position in bestG or len(bestG) < max_nodes:
+                bestG[position] = g
+
+            if stats is not None:
+                stats["expanded"] += 1
+            if h < bestH:
+                bestH = h
+                bestPath = path + [position]
+            expanded += 1
+            if deadline is not None and expanded % deadline_check_interval == 0 and time.perf_counter() >= deadline:
+                return bestPath
+
+            path.append(position)
+            onPath.add(position)
+            stack.append(children(position, g + 1, onPath))
+        if nextBound is None:
+            return None
+        bound = nextBound
+    return None
+
+
+# the path finding algorithms the agent can use
+planners = {
+    "list": astar,
+    "heap": astar_heap,
+    "ida": astar_ida
+}
+
+
+# method that returns the move towards the second position of the path. Only the sign of the step is used and a step in
+# the x direction goes first, the move is looked up in the table of move.py
+
+
 def resolveMovePath(path, direction, head_position):
-        # move in the x direction
-    if path[1][0] != head_position[0]:
-        if path[1][0] > head_position[0]:
-            if direction == Direction.EAST:
-                return Move.STRAIGHT
-            elif direction == Direction.NORTH:
-                return Move.RIGHT
-            elif direction == Direction.WEST or direction == Direction.SOUTH:
-                return Move.LEFT
-        elif path[1][0] < head_position[0]:
-            if direction == Direction.WEST:
-                return Move.STRAIGHT
-            elif direction == Direction.NORTH:
-                return Move.LEFT
-            elif direction == Direction.EAST or direction == Direction.SOUTH:
-                return Move.RIGHT
-
-    if path[1][1] != head_position[1]:
-        if path[1][1] > head_position[1]:
-            if direction == Direction.WEST:
-                return Move.LEFT
-            elif direction == Direction.SOUTH:
-                return Move.STRAIGHT
-            elif direction == Direction.EAST or direction == Direction.NORTH:
-                return Move.RIGHT
-        elif path[1][1] < head_position[1]:
-            if direction == Direction.EAST:
-                return Move.LEFT
-            elif direction == Direction.NORTH:
-                return Move.STRAIGHT
-            elif direction == Direction.WEST or direction == Direction.SOUTH:
-                return Move.RIGHT
-
-
-def resolveMoveNoPath(board, head_position):
+    dx = (path[1][0] > head_position[0]) - (path[1][0] < head_position[0])
+    dy = 0 if dx else (path[1][1] > head_position[1]) - (path[1][1] < head_position[1])
+    return moves_by_step[direction.value].get((dx, dy))
+
+
+# method that picks a survival move when there is no path to food. Of all cells next to the head that can be entered,
+# the one from which the most cells can still be reached is chosen. The reachable areas are computed with flood fills
+# on a bitboard. The tail moves away during the move, so its cell counts as free, unless the snake has just eaten and
+# grows during the move or the tail is the only body part, which lies directly behind the head
+
+
+def resolveMoveNoPath(board, head_position, body_parts=(), growth=0):
     path = []
     path.append(head_position)
+    bitBoard = BitBoard.from_board(board)
+    tail = body_parts[-1] if len(body_parts) > 1 and not growth else None
+    blocked = bitBoard.walls | bitBoard.body | bitBoard.head
+    if tail is not None:
+        blocked &= ~bitBoard.bit(tail[0], tail[1])
+
+    bestPos = None
+    bestArea = 0
     for neighborOffset in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
-            # Get node position
+        # Get node position
         neighborPos = (
             head_position[0] + neighborOffset[0], head_position[1] + neighborOffset[1])
-        if (neighborPos[0] < (len(board)) and neighborPos[0] >= 0 and neighborPos[1] < (len(board[len(board)-1])) and neighborPos[1] >= 0):
-            if board[neighborPos[0]][neighborPos[1]] == GameObject.EMPTY or board[neighborPos[0]][neighborPos[1]] == GameObject.FOOD:
-                path.append(neighborPos)
-                return path
+        area = bitBoard.reachable_area(neighborPos[0], neighborPos[1], blocked)
+        if area > bestArea:
+            bestArea = area
+            bestPos = neighborPos
+
+    if bestPos is not None:
+        path.append(bestPos)
+        return path
     print("Goodbye cruel world, i'm stuck :(")
     return path
 
 
 class Agent:
 
-    def __init__(self):
-        """" Constructor of the Agent, can be used to set up variables """
+    def __init__(self, planner="heap", time_budget=None, max_nodes=None):
+        """" Constructor of the Agent, can be used to set up variables
+
+        :param planner: The name of the path finding algorithm to use, see planners. "heap" uses a binary heap as open
+        set, "list" is the original implementation which scans a list and "ida" is iterative deepening A*, which uses
+        a bounded amount of memory.
+
+        :param time_budget: The maximum number of seconds to spend on planning per move, None for no limit. When the
+        planner runs out of time, the snake follows the partial path towards the food and planning continues during
+        the next moves until a complete path is found.
+
+        :param max_nodes: The maximum number of positions the "ida" planner remembers, None for ida_max_nodes. Not
+        supported by the other planners.
+        """
         self.path = []
+        self.path_complete = True
+        # score during the previous move, a higher score means the snake has just eaten and still has to grow
+        self.previous_score = 0
+        self.time_budget = time_budget
+        self.planner = planners[planner]
+        if max_nodes is not None:
+            self.planner = functools.partial(self.planner, max_nodes=max_nodes)
+        # number of searches and expanded nodes, used for benchmarking
+        self.search_stats = {"searches": 0, "expanded": 0}
 
     def get_move(self, board, score, turns_alive, turns_to_starve, direction, head_position, body_parts):
         """This function behaves as the 'brain' of the snake. You only need to change the code in this function for
@@ -282,9 +585,20 @@ class Agent:
         move left is made, the snake will go one block to the left and change its direction to west.
         """
 
-        if len(self.path) <= 1:
-            self.path = astar(head_position, board,
-                              score, body_parts)
+        # when the snake has just eaten, it grows during this move
+        growth = 1 if score > self.previous_score and self.should_grow_on_food_collision() else 0
+        self.previous_score = score
+
+        if len(self.path) <= 1 or not self.path_complete:
+            deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+            self.search_stats["searches"] += 1
+            path = self.planner(head_position, board,
+                                score, body_parts, self.search_stats, deadline, growth)
+            complete = path is not None and board[path[-1][0]][path[-1][1]] == GameObject.FOOD
+            # a new partial path only replaces the current plan when that plan is used up
+            if complete or len(self.path) <= 1:
+                self.path = path
+                self.path_complete = complete
 
         # print(
         #     "Current position: {0}\nPath: {1}]\nScore: {2}\n-----".format(head_position, self.path, score))
@@ -294,7 +608,7 @@ class Agent:
             del self.path[0]
             return tempMove
         else:
-            self.path = resolveMoveNoPath(board, head_position)
+            self.path = resolveMoveNoPath(board, head_position, body_parts, growth)
             # time.sleep(1)
             if self.path:
                 if len(self.path) > 1:
@@ -315,6 +629,18 @@ class Agent:
         """
         return True
 
+    def should_copy_board(self):
+        """
+        This function indicates whether the board given to get_move should be a copy. A copy is a new two dimensional
+        array which can be changed freely, but creating it takes time proportional to the size of the board. When
+        this function returns False, a read-only view on the board is given instead. The view can be indexed in the
+        same way (board[x][y]), but can not be changed and is only valid during the call to get_move. The function is
+        called before the get_move function.
+
+        :return: True if a copy of the board should be given, False if a read-only view is sufficient.
+        """
+        return False
+
     def should_grow_on_food_collision(self):
         """
         This function indicates whether the snake should grow when colliding with a food object. This function is
@@ -342,3 +668,7 @@ class Agent:
         When the snake runs in its own body the following holds: head_position in body_parts.
         """
         print("score:", score)
+        # the path and the score belong to the snake that died
+        self.path = []
+        self.path_complete = True
+        self.previous_score = 0
@@ -0,0 +1,286 @@
+import multiprocessing
+import random
+from time import perf_counter
+
+from board import Board
+from engine import GameResult
+from gameobjects import GameObject
+from move import Move
+from snake import Snake
+
+
+def run_worker(connection, agent):
+    """
+    Main function of a worker process, answers the requests of an AgentWorker until it is closed. An exception raised
+    by the agent is answered with None, which kills the snake with an invalid move instead of the whole arena.
+    """
+    while True:
+        message = connection.recv()
+        if message[0] == "get_move":
+            tick, args = message[1], message[2]
+            try:
+                move = agent.get_move(*args)
+                should_grow = agent.should_grow_on_food_collision()
+            except Exception:
+                move, should_grow = None, True
+            connection.send((tick, move, should_grow))
+        elif message[0] == "on_die":
+            agent.on_die(*message[1])
+        elif message[0] == "close":
+            return
+
+
+class AgentWorker:
+    """
+    Runs an agent in its own process. A move is requested with request_move() and collected with collect_move(), so
+    the moves of all snakes are computed at the same time. The other functions of the agent interface answer for the
+    agent in the worker.
+    """
+
+    def __init__(self, agent, default_move=Move.STRAIGHT):
+        """
+        :param agent: The agent, a copy of it is sent to the worker process.
+
+        :param default_move: The move made when the agent does not answer in time.
+        """
+        self.connection, child_connection = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=run_worker, args=(child_connection, agent), daemon=True)
+        self.process.start()
+        child_connection.close()
+        self.default_move = default_move
+        self.should_grow = True
+        self.timeouts = 0
+
+    def request_move(self, tick, args):
+        """
+        :param tick: The turn the move is requested for, answers to earlier turns that come in late are dropped.
+
+        :param args: The arguments of get_move.
+        """
+        self.connection.send(("get_move", tick, args))
+
+    def collect_move(self, tick, deadline):
+        """
+        :param deadline: The value of perf_counter() at which waiting for the move stops, None to wait forever.
+
+        :return: The move of the agent, the default move when it did not answer before the deadline.
+        """
+        while True:
+            if deadline is not None and not self.connection.poll(max(0.0, deadline - perf_counter())):
+                self.timeouts += 1
+                return self.default_move
+            reply_tick, move, should_grow = self.connection.recv()
+            if reply_tick == tick:
+                self.should_grow = should_grow
+                return move
+
+    def should_redraw_board(self):
+        return True
+
+    def should_copy_board(self):
+        return True
+
+    def should_grow_on_food_collision(self):
+        # the answer the agent gave together with its last move
+        return self.should_grow
+
+    def on_die(self, *args):
+        self.connection.send(("on_die", args))
+
+    def close(self):
+        try:
+            self.connection.send(("close",))
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.connection.close()
+
+
+class InlineWorker:
+    """
+    Runs an agent in the arena process itself, with the interface of AgentWorker. The moves are computed one after
+    the other and there is no timeout. All other attributes are taken from the agent.
+    """
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.move = None
+        self.timeouts = 0
+
+    def request_move(self, tick, args):
+        self.move = self.agent.get_move(*args)
+
+    def collect_move(self, tick, deadline):
+        return self.move
+
+    def close(self):
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self.agent, name)
+
+
+class SnakeGroup:
+    """
+    Takes the place of the snake of a board on which several snakes play, so the board sees the cells of all snakes.
+    """
+
+    # Board.get_copy() draws the body parts and the head at (x, y). The body parts of the group contain the heads of
+    # all snakes, so there is no separate head and (x, y) lies outside of the board.
+    x = -1
+    y = -1
+
+    def __init__(self, snakes):
+        self.snakes = snakes
+
+    @property
+    def body_parts(self):
+        cells = []
+        for snake in self.snakes:
+            cells.append((snake.x, snake.y))
+            cells.extend(snake.body_parts)
+        return cells
+
+    def contains_head(self, x, y):
+        return any(snake.contains_head(x, y) for snake in self.snakes)
+
+    def contains_body(self, x, y):
+        return any(snake.contains_body(x, y) for snake in self.snakes)
+
+
+class Arena:
+    """
+    Plays a game in which several snakes share a board. Every turn all agents are asked for their move at the same
+    time, every agent in its own worker process, and the moves are applied together. A snake dies when it leaves the
+    board or runs into a wall, its own body or another snake. When two heads enter the same cell, both snakes die.
+    Dead snakes are reborn at a random free cell.
+    """
+
+    def __init__(self, agents, board_width=25, board_height=25, max_nr_food=1, nr_walls=1, test_config=True,
+                 starvation_tics=-1, print_score=False, seed=None, board_class=Board, move_timeout=0.1,
+                 use_processes=True):
+        """
+        :param agents: A list with the agent of every snake.
+
+        :param move_timeout: The number of seconds the agents get to answer every turn, None to wait for all of them.
+        An agent that answers too late goes straight. Only used when use_processes is True.
+
+        :param use_processes: Indicates whether the agents run in worker processes. Otherwise the agents are asked
+        for their moves one after the other in this process.
+
+        See GameEngine for the other parameters.
+        """
+        if seed is not None:
+            random.seed(seed)
+        self.seed = seed
+        self.print_score = print_score
+        self.move_timeout = move_timeout if use_processes else None
+        self.workers = [AgentWorker(agent) if use_processes else InlineWorker(agent) for agent in agents]
+        self.snakes = [Snake(board_width, board_height, starvation_tics, worker) for worker in self.workers]
+        self.group = SnakeGroup(self.snakes)
+        self.board = board_class(board_width, board_height, board_width, board_height, self.group, max_nr_food,
+                                 nr_walls, test_config)
+        for snake in self.snakes:
+            snake.respawn(self.board)
+        self.tics = 0
+        # the GameResults of every snake
+        self.results = [[] for snake in self.snakes]
+
+    def get_agent_board(self):
+        """
+        :return: The copy of the board given to every agent. The heads of all snakes are marked as SNAKE_HEAD.
+        """
+        copy = self.board.get_copy()
+        for snake in self.snakes:
+            if 0 <= snake.x < self.board.width and 0 <= snake.y < self.board.height:
+                copy[snake.x][snake.y] = GameObject.SNAKE_HEAD
+        return copy
+
+    def tick(self):
+        """
+        Advances the game a single turn.
+
+        :return: A list of (snake index, GameResult) for every snake that died during this turn.
+        """
+        self.tics += 1
+        board = self.board
+        agent_board = self.get_agent_board()
+
+        # ask all agents for their move before waiting for any answer
+        requested = []
+        for i, snake in enumerate(self.snakes):
+            if snake.tics_to_starve == 0:
+                snake.cause_of_death = "starved"
+                continue
+            self.workers[i].request_move(self.tics, (agent_board, snake.score, snake.tics_alive,
+                                                     snake.tics_to_starve, snake.direction, (snake.x, snake.y),
+                                                     snake.body_parts))
+            requested.append(i)
+        deadline = perf_counter() + self.move_timeout if self.move_timeout is not None else None
+        moved = []
+        for i in requested:
+            move = self.workers[i].collect_move(self.tics, deadline)
+            if not isinstance(move, Move):
+                self.snakes[i].cause_of_death = "invalid_move"
+            else:
+                moved.append((i, move))
+
+        # apply all moves, then check the collisions on the new positions
+        previous_heads = {}
+        for i, move in moved:
+            snake = self.snakes[i]
+            previous_heads[i] = (snake.x, snake.y)
+            snake.move_body(board, move)
+        heads = {}
+        for i, move in moved:
+            snake = self.snakes[i]
+            heads.setdefault((snake.x, snake.y), []).append(i)
+        for i, move in moved:
+            snake = self.snakes[i]
+            cause = snake.get_cause_of_death(board)
+            # two heads in the same cell, or two heads that swapped places
+            if cause is None and (len(heads[(snake.x, snake.y)]) > 1 or
+                                  any(j != i and previous_heads[j] == (snake.x, snake.y)
+                                      for j in heads.get(previous_heads[i], ()))):
+                cause = "head_to_head"
+            if cause is None and any(other is not snake and (other.contains_head(snake.x, snake.y) or
+                                                             other.contains_body(snake.x, snake.y))
+                                     for other in self.snakes):
+                cause = "other_snake"
+            snake.cause_of_death = cause
+        for i, move in moved:
+            if self.snakes[i].cause_of_death is None:
+                self.snakes[i].end_turn(board)
+
+        finished = []
+        for i, snake in enumerate(self.snakes):
+            if snake.cause_of_death is not None:
+                result = GameResult(snake.score, snake.tics_alive, snake.cause_of_death)
+                self.results[i].append(result)
+                finished.append((i, result))
+                snake.reset(board, self.print_score, True)
+        return finished
+
+    def run(self, n_ticks):
+        """
+        Advances the game a given number of turns.
+
+        :return: A list of (snake index, GameResult) for every snake that died during these turns.
+        """
+        finished = []
+        for i in range(n_ticks):
+            finished.extend(self.tick())
+        return finished
+
+    def get_timeouts(self):
+        """
+        :return: A list with the number of turns every agent did not answer in time.
+        """
+        return [worker.timeouts for worker in self.workers]
+
+    def close(self):
+        """ Stops the worker processes """
+        for worker in self.workers:
+            worker.close()
@@ -0,0 +1,132 @@
+import numpy as np
+
+from board import Board
+from gameobjects import GameObject
+
+# the values of the game objects as stored in the arrays
+WALL = GameObject.WALL.value
+FOOD = GameObject.FOOD.value
+EMPTY = GameObject.EMPTY.value
+SNAKE_HEAD = GameObject.SNAKE_HEAD.value
+SNAKE_BODY = GameObject.SNAKE_BODY.value
+
+# maps a value in the array back to its game object
+objects_by_value = {game_object.value: game_object for game_object in GameObject}
+
+
+def to_array(board):
+    """
+    Converts a two dimensional array of game objects, like the board given to Agent.get_move, to a NumPy array.
+
+    :param board: The board to convert, board[x][y] is the game object at (x, y).
+
+    :return: An int8 array of shape (width, height) holding the values of the game objects.
+    """
+    return np.array([[game_object.value for game_object in column] for column in board], dtype=np.int8)
+
+
+def food_positions(grid):
+    """
+    :param grid: An int8 array of game object values.
+
+    :return: An array of shape (n, 2) with the (x, y) positions of all food blocks.
+    """
+    return np.argwhere(grid == FOOD)
+
+
+def free_mask(grid):
+    """
+    :param grid: An int8 array of game object values.
+
+    :return: A boolean array which is True for every cell the snake can safely move to (empty or food).
+    """
+    return (grid == EMPTY) | (grid == FOOD)
+
+
+def distance_to_wall(grid):
+    """
+    Calculates for every cell the Manhattan distance to the nearest wall or to the nearest cell outside of the board.
+    The distance transform is separable, so it is computed with two passes along each axis.
+
+    :param grid: An int8 array of game object values.
+
+    :return: An int32 array of shape (width, height) with the distances. Walls have distance 0.
+    """
+    width, height = grid.shape
+    distance = np.where(grid == WALL, 0, width + height).astype(np.int32)
+    for x in range(1, width):
+        np.minimum(distance[x], distance[x - 1] + 1, out=distance[x])
+    for x in range(width - 2, -1, -1):
+        np.minimum(distance[x], distance[x + 1] + 1, out=distance[x])
+    for y in range(1, height):
+        np.minimum(distance[:, y], distance[:, y - 1] + 1, out=distance[:, y])
+    for y in range(height - 2, -1, -1):
+        np.minimum(distance[:, y], distance[:, y + 1] + 1, out=distance[:, y])
+
+    # the cells just outside of the board count as walls
+    xs = np.arange(width)
+    ys = np.arange(height)
+    to_edge = np.minimum.outer(np.minimum(xs + 1, width - xs), np.minimum(ys + 1, height - ys))
+    return np.minimum(distance, to_edge)
+
+
+class ArrayBoard(Board):
+    """
+    Board which stores the walls and food in a compact NumPy int8 array, indexed as board[x, y], instead of a list of
+    lists of game objects. It behaves like a Board and additionally offers vectorized access to the whole board.
+    """
+
+    def create_grid(self):
+        return np.full((self.width, self.height), EMPTY, dtype=np.int8)
+
+    def get_game_object_at(self, x, y):
+        if self.snake.contains_head(x, y):
+            return GameObject.SNAKE_HEAD
+        if self.snake.contains_body(x, y):
+            return GameObject.SNAKE_BODY
+        return objects_by_value[self.board[x, y]]
+
+    def is_wall_at(self, x, y):
+        return self.board[x, y] == WALL
+
+    def is_food_at(self, x, y):
+        return self.board[x, y] == FOOD
+
+    def set_game_object_at(self, x, y, game_object):
+        was_wall = self.is_wall_at(x, y)
+        self.board[x, y] = game_object.value
+        self.update_object_indexes(x, y, was_wall, game_object)
+        self.update_cell(x, y)
+
+    def get_array(self):
+        """
+        :return: A copy of the board as int8 array including the snake.
+        """
+        grid = self.board.copy()
+        if self.snake.body_parts:
+            body = np.array(self.snake.body_parts)
+            grid[body[:, 0], body[:, 1]] = SNAKE_BODY
+        if 0 <= self.snake.x < self.width and 0 <= self.snake.y < self.height:
+            grid[self.snake.x, self.snake.y] = SNAKE_HEAD
+        return grid
+
+    def get_array_without_snake(self):
+        """
+        :return: A copy of the board as int8 array containing only the walls and food.
+        """
+        return self.board.copy()
+
+    def get_copy(self):
+        return [[objects_by_value[value] for value in column] for column in self.get_array().tolist()]
+
+    def get_copy_without_snake(self):
+        return [[objects_by_value[value] for value in column] for column in self.board.tolist()]
+
+    def food_positions(self):
+        return food_positions(self.board)
+
+    def free_mask(self):
+        return free_mask(self.get_array())
+
+    def distance_to_wall(self):
+        return distance_to_wall(self.board)
@@ -0,0 +1,245 @@
+import argparse
+import json
+import platform
+import random
+import time
+
+import agent
+from engine import GameEngine
+from gameobjects import GameObject
+
+default_sizes = [25, 50, 100, 200]
+default_wall_densities = [0.0, 0.05, 0.15]
+default_snake_lengths = [0, 50, 400]
+
+
+def percentile(sorted_values, q):
+    """
+    :param sorted_values: A sorted list of numbers.
+
+    :param q: The percentile to return, between 0 and 100.
+
+    :return: The value at the given percentile (nearest rank), 0 for an empty list.
+    """
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class TimedAgent:
+    """
+    Wraps an agent and measures the duration of every call to get_move. All other attributes are taken from the
+    wrapped agent.
+    """
+
+    def __init__(self, wrapped):
+        self.wrapped = wrapped
+        self.latencies = []
+
+    def get_move(self, *args):
+        start = time.perf_counter()
+        move = self.wrapped.get_move(*args)
+        self.latencies.append(time.perf_counter() - start)
+        return move
+
+    def on_die(self, *args):
+        # the bundled agent prints on every death, which would only measure the console
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self.wrapped, name)
+
+
+def benchmark_engine(size, wall_density, ticks, seed):
+    """
+    Plays a game with the bundled agent and measures the number of turns per second and the latency of get_move.
+
+    :return: A dict with the settings and the measurements.
+    """
+    nr_walls = int(wall_density * size * size)
+    engine = GameEngine(size, size, nr_walls=nr_walls, test_config=False, seed=seed)
+    timed_agent = TimedAgent(engine.snake.agent)
+    engine.snake.agent = timed_agent
+
+    start = time.perf_counter()
+    engine.run(ticks)
+    duration = time.perf_counter() - start
+
+    latencies = sorted(timed_agent.latencies)
+    return {
+        "size": size,
+        "wall_density": wall_density,
+        "ticks": ticks,
+        "ticks_per_second": ticks / duration,
+        "games": len(engine.results),
+        "get_move_p50_ms": percentile(latencies, 50) * 1000,
+        "get_move_p95_ms": percentile(latencies, 95) * 1000,
+        "get_move_p99_ms": percentile(latencies, 99) * 1000,
+        "get_move_max_ms": latencies[-1] * 1000 if latencies else 0
+    }
+
+
+def make_planner_scenario(size, wall_density, snake_length, seed):
+    """
+    Builds a board for a single search. The snake lies in a serpentine pattern starting at the top left corner, the
+    walls are spread at random over the remaining cells and the food is placed on a free cell far from the head.
+
+    :return: A tuple (board, head_position, body_parts) in the format given to Agent.get_move.
+    """
+    rng = random.Random(seed)
+    board = [[GameObject.EMPTY for y in range(size)] for x in range(size)]
+    cells = []
+    for y in range(size):
+        row = range(size) if y % 2 == 0 else range(size - 1, -1, -1)
+        cells.extend((x, y) for x in row)
+    snake_cells = cells[:snake_length + 1]
+    head_position = snake_cells[-1]
+    body_parts = snake_cells[-2::-1]
+    for x, y in body_parts:
+        board[x][y] = GameObject.SNAKE_BODY
+    board[head_position[0]][head_position[1]] = GameObject.SNAKE_HEAD
+
+    free = cells[snake_length + 1:]
+    rng.shuffle(free)
+    for x, y in free[:int(wall_density * size * size)]:
+        board[x][y] = GameObject.WALL
+    # the free cell with the largest distance to the head gets the food
+    remaining = free[int(wall_density * size * size):]
+    food = max(remaining, key=lambda cell: abs(cell[0] - head_position[0]) + abs(cell[1] - head_position[1]))
+    board[food[0]][food[1]] = GameObject.FOOD
+    return board, head_position, body_parts
+
+
+def benchmark_planner(planner, size, wall_density, snake_length, repeats, seed):
+    """
+    Measures the number of nodes the given planner expands per second.
+
+    :return: A dict with the settings and the measurements, or None when the snake does not fit on the board.
+    """
+    if snake_length + 1 > size * size // 2:
+        return None
+    board, head_position, body_parts = make_planner_scenario(size, wall_density, snake_length, seed)
+    stats = {"searches": 0, "expanded": 0}
+    durations = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        agent.planners[planner](head_position, board, 0, body_parts, stats)
+        durations.append(time.perf_counter() - start)
+        stats["searches"] += 1
+    durations.sort()
+    return {
+        "planner": planner,
+        "size": size,
+        "wall_density": wall_density,
+        "snake_length": snake_length,
+        "expanded_per_search": stats["expanded"] / repeats,
+        "nodes_per_second": stats["expanded"] / sum(durations) if sum(durations) > 0 else 0,
+        "search_p50_ms": percentile(durations, 50) * 1000,
+        "search_max_ms": durations[-1] * 1000
+    }
+
+
+def run(sizes=None, wall_densities=None, snake_lengths=None, ticks=500, repeats=3, planners=None, seed=0):
+    """
+    Runs the complete benchmark suite. Every measurement uses a fixed seed, so two runs play the same games and plan
+    on the same boards.
+
+    :return: A dict with the settings of the run and the lists of engine and planner measurements.
+    """
+    sizes = sizes or default_sizes
+    wall_densities = wall_densities if wall_densities is not None else default_wall_densities
+    snake_lengths = snake_lengths if snake_lengths is not None else default_snake_lengths
+    planners = planners or ["heap"]
+    results = {
+        "settings": {
+            "sizes": sizes,
+            "wall_densities": wall_densities,
+            "snake_lengths": snake_lengths,
+            "ticks": ticks,
+            "repeats": repeats,
+            "planners": planners,
+            "seed": seed,
+            "python": platform.python_version(),
+            "time": time.strftime("%Y-%m-%d %H:%M:%S")
+        },
+        "engine": [],
+        "planner": []
+    }
+    for size in sizes:
+        for wall_density in wall_densities:
+            results["engine"].append(benchmark_engine(size, wall_density, ticks, seed))
+            for snake_length in snake_lengths:
+                for planner in planners:
+                    result = benchmark_planner(planner, size, wall_density, snake_length, repeats, seed)
+                    if result is not None:
+                        results["planner"].append(result)
+    return results
+
+
+def compare(old, new):
+    """
+    Prints the measurements of two runs side by side.
+
+    :param old: The results of the baseline run, as returned by run().
+
+    :param new: The results of the new run.
+    """
+    def key(result, fields):
+        return tuple(result[field] for field in fields)
+
+    for section, fields, metric in [("engine", ["size", "wall_density"], "ticks_per_second"),
+                                    ("planner", ["planner", "size", "wall_density", "snake_length"],
+                                     "nodes_per_second")]:
+        old_results = {key(result, fields): result for result in old[section]}
+        print("{} ({})".format(section, metric))
+        for result in new[section]:
+            previous = old_results.get(key(result, fields))
+            if previous is None or previous[metric] == 0:
+                continue
+            print("  {:<40} {:>14.1f} {:>14.1f} {:>8.2f}x".format(str(key(result, fields)), previous[metric],
+                                                                 result[metric], result[metric] / previous[metric]))
+
+
+def print_results(results):
+    print("{:>6} {:>6} {:>12} {:>10} {:>10} {:>10} {:>10}".format("size", "walls", "ticks/s", "p50 ms", "p95 ms",
+                                                                 "p99 ms", "max ms"))
+    for result in results["engine"]:
+        print("{:>6} {:>6} {:>12.1f} {:>10.3f} {:>10.3f} {:>10.3f} {:>10.3f}".format(
+            result["size"], result["wall_density"], result["ticks_per_second"], result["get_move_p50_ms"],
+            result["get_move_p95_ms"], result["get_move_p99_ms"], result["get_move_max_ms"]))
+    print()
+    print("{:>8} {:>6} {:>6} {:>8} {:>12} {:>12} {:>10}".format("planner", "size", "walls", "length", "expanded",
+                                                               "nodes/s", "p50 ms"))
+    for result in results["planner"]:
+        print("{:>8} {:>6} {:>6} {:>8} {:>12.0f} {:>12.0f} {:>10.3f}".format(
+            result["planner"], result["size"], result["wall_density"], result["snake_length"],
+            result["expanded_per_search"], result["nodes_per_second"], result["search_p50_ms"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure engine speed and planner latency with fixed seeds.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=default_sizes)
+    parser.add_argument("--wall-densities", type=float, nargs="+", default=default_wall_densities)
+    parser.add_argument("--snake-lengths", type=int, nargs="+", default=default_snake_lengths)
+    parser.add_argument("--ticks", type=int, default=500, help="number of turns per engine measurement")
+    parser.add_argument("--repeats", type=int, default=3, help="number of searches per planner measurement")
+    parser.add_argument("--planners", nargs="+", default=["heap"], choices=sorted(agent.planners))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark.json", help="file to save the results to")
+    parser.add_argument("--compare", default=None, help="results of an earlier run to compare with")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.wall_densities, args.snake_lengths, args.ticks, args.repeats, args.planners,
+                  args.seed)
+    print_results(results)
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            print()
+            compare(json.load(file), results)
+
+
+if __name__ == "__main__":
+    main()
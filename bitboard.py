@@ -0,0 +1,153 @@
+from gameobjects import GameObject
+
+
+def count_bits(mask):
+    return bin(mask).count("1")
+
+
+class BitBoard:
+    """
+    Represents sets of cells of a board as Python integers, where bit y * width + x stands for cell (x, y). Sets of
+    cells are combined with & and |, and all neighbors of a set are found with four shifts, so operations on the whole
+    board take a handful of big integer operations instead of a loop over the cells.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.full = (1 << (width * height)) - 1
+        first_column = 0
+        for y in range(height):
+            first_column |= 1 << (y * width)
+        # shifting east or west moves cells of the last column into the first column of the next row and vice versa,
+        # these masks remove them again
+        self.not_first_column = self.full & ~first_column
+        self.not_last_column = self.full & ~(first_column << (width - 1))
+
+        self.walls = 0
+        self.food = 0
+        self.body = 0
+        self.head = 0
+
+    @classmethod
+    def from_board(cls, board):
+        """
+        :param board: A two dimensional array of game objects (board[x][y]), like the board given to Agent.get_move.
+
+        :return: A BitBoard with the walls, food, body and head of the given board.
+        """
+        bit_board = cls(len(board), len(board[0]))
+        masks = {GameObject.WALL: 0, GameObject.FOOD: 0, GameObject.SNAKE_BODY: 0, GameObject.SNAKE_HEAD: 0}
+        for x in range(bit_board.width):
+            column = board[x]
+            for y in range(bit_board.height):
+                game_object = column[y]
+                if game_object in masks:
+                    masks[game_object] |= 1 << (y * bit_board.width + x)
+        bit_board.walls = masks[GameObject.WALL]
+        bit_board.food = masks[GameObject.FOOD]
+        bit_board.body = masks[GameObject.SNAKE_BODY]
+        bit_board.head = masks[GameObject.SNAKE_HEAD]
+        return bit_board
+
+    def bit(self, x, y):
+        """
+        :return: The mask containing only cell (x, y), 0 when the cell is outside of the board.
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return 0
+        return 1 << (y * self.width + x)
+
+    def mask_of(self, positions):
+        mask = 0
+        for x, y in positions:
+            mask |= self.bit(x, y)
+        return mask
+
+    def positions_of(self, mask):
+        """
+        :return: A list of the (x, y) positions of the cells in the mask.
+        """
+        positions = []
+        while mask:
+            lowest = mask & -mask
+            index = lowest.bit_length() - 1
+            positions.append((index % self.width, index // self.width))
+            mask ^= lowest
+        return positions
+
+    def neighbors(self, mask):
+        """
+        :return: The mask of all cells next to a cell in the given mask (the cells of the mask itself excluded unless
+        they neighbor another cell of the mask).
+        """
+        east = (mask << 1) & self.not_first_column
+        west = (mask >> 1) & self.not_last_column
+        south = (mask << self.width) & self.full
+        north = mask >> self.width
+        return east | west | south | north
+
+    def blocked(self):
+        """
+        :return: The mask of all cells the snake dies on, walls and the body.
+        """
+        return self.walls | self.body
+
+    def is_blocked(self, x, y):
+        """
+        :return: True when moving the head to (x, y) kills the snake.
+        """
+        bit = self.bit(x, y)
+        return bit == 0 or bool(bit & self.blocked())
+
+    def flood_fill(self, start, blocked):
+        """
+        :param start: The mask of cells to start from.
+
+        :param blocked: The mask of cells that can not be entered.
+
+        :return: The mask of all cells reachable from the start cells, including the start cells.
+        """
+        passable = self.full & ~blocked
+        reached = start
+        while True:
+            grown = reached | (self.neighbors(reached) & passable)
+            if grown == reached:
+                return reached
+            reached = grown
+
+    def reachable_area(self, x, y, blocked):
+        """
+        :return: The number of cells reachable from (x, y) without entering a blocked cell, 0 if (x, y) is blocked.
+        """
+        start = self.bit(x, y)
+        if start == 0 or start & blocked:
+            return 0
+        return count_bits(self.flood_fill(start, blocked))
+
+    def can_reach(self, start, target, blocked):
+        """
+        :param start: (x, y) of the start cell.
+
+        :param target: (x, y) of the target cell, the target itself may be blocked.
+
+        :return: True if the target can be reached from the start.
+        """
+        target_bit = self.bit(*target)
+        reached = self.flood_fill(self.bit(*start), blocked & ~target_bit)
+        return bool(reached & target_bit)
+
+    def can_reach_tail(self, head_position, body_parts):
+        """
+        Checks whether the head can still reach the tail. As long as this holds, the snake can follow its own tail
+        and does not trap itself.
+
+        :param head_position: (x, y) of the head.
+
+        :param body_parts: The body parts of the snake, the last element is the tail.
+
+        :return: True if the tail can be reached, also True for a snake without body.
+        """
+        if not body_parts:
+            return True
+        return self.can_reach(head_position, body_parts[-1], self.walls | self.mask_of(body_parts))
@@ -1,31 +1,61 @@
 from random import randint
+from distancefield import DistanceFields
+from foodindex import FoodIndex
 from gameobjects import *
 
 
 class Board:
-    max_random_tries = 5
-
     def __init__(self, board_width, board_height, canvas_width, canvas_height, snake, max_nr_food, nr_walls,
                  test_config):
         self.snake = snake
         self.width = board_width
         self.height = board_height
-        self.board = [[GameObject.EMPTY for x in range(board_width)] for y in range(board_height)]
+        self.board = self.create_grid()
         self.block_width = canvas_width / board_width
         self.block_height = canvas_height / board_height
         self.max_nr_food = max_nr_food
         self.wall_pos_not_allowed = [(0, 1), (1, 0), (self.width - 2, 0), (self.width - 1, 1), (self.width - 1, self.height - 2),
                            (self.width - 2, self.height - 1), (0, self.height - 2), (1, self.height - 1)]
+        # index of all empty cells: free_cells holds the positions, free_cell_index maps a position to its index in
+        # free_cells. A cell is removed by moving the last position into its place, so every update takes O(1)
+        self.free_cells = []
+        self.free_cell_index = {}
+        # sets of cells that changed since their owner last cleared them, see track_changes()
+        self.change_trackers = []
+        # positions of the food, the buckets are sized to hold about one food block each
+        self.food_index = FoodIndex(self.width, self.height,
+                                    max(4, int((self.width * self.height / max(1, max_nr_food)) ** 0.5)))
+        # positions of the walls
+        self.walls = set()
+        # distances over the walls to the food and to targets of the agent
+        self.distance_fields = DistanceFields(self)
+        self.index_free_cells()
         if not test_config:
             for i in range(nr_walls):
                 self.spawn_wall()
         else:
-            self.set_game_object_at(7, 5, GameObject.WALL)
-            self.set_game_object_at(15, 8, GameObject.WALL)
+            # the walls of the test configuration are left out when the board is too small for them
+            for x, y in [(7, 5), (15, 8)]:
+                if x < self.width and y < self.height:
+                    self.set_game_object_at(x, y, GameObject.WALL)
 
         for i in range(max_nr_food):
             self.spawn_new_food()
 
+        self.view = BoardView(self)
+
+    def create_grid(self):
+        """
+        :return: The storage of the static objects (walls and food) on the board, initially empty.
+        """
+        return [[GameObject.EMPTY for y in range(self.height)] for x in range(self.width)]
+
+    def index_free_cells(self):
+        """ Fills the index of empty cells, see update_cell() """
+        for x in range(self.width):
+            for y in range(self.height):
+                self.update_cell(x, y)
+
     def get_game_object_at(self, x, y):
         if self.board[x][y] is None:
             return GameObject.EMPTY
@@ -38,8 +68,68 @@ class Board:
     def is_wall_at(self, x, y):
         return self.board[x][y] == GameObject.WALL
 
+    def is_food_at(self, x, y):
+        return self.board[x][y] == GameObject.FOOD
+
     def set_game_object_at(self, x, y, game_object):
+        was_wall = self.is_wall_at(x, y)
         self.board[x][y] = game_object
+        self.update_object_indexes(x, y, was_wall, game_object)
+        self.update_cell(x, y)
+
+    def update_object_indexes(self, x, y, was_wall, game_object):
+        """
+        Updates the walls, the food index and the distance fields after a wall or food block was placed or removed.
+        This function needs to be called by every change of the static objects.
+
+        :param was_wall: True if the cell held a wall before the change.
+        """
+        is_food = game_object == GameObject.FOOD
+        is_wall = game_object == GameObject.WALL
+        if is_wall != was_wall:
+            if is_wall:
+                self.walls.add((x, y))
+            else:
+                self.walls.discard((x, y))
+            self.distance_fields.update_wall(x, y, is_wall)
+        elif is_food or (x, y) in self.food_index:
+            self.distance_fields.invalidate(False)
+        self.food_index.update(x, y, is_food)
+
+    def update_cell(self, x, y):
+        """
+        Updates the index of empty cells and the change trackers for the given cell. This function needs to be called
+        whenever the object at the cell may have changed, including changes caused by the snake moving.
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return
+        position = (x, y)
+        for tracker in self.change_trackers:
+            tracker.add(position)
+        if self.get_game_object_at(x, y) == GameObject.EMPTY:
+            if position not in self.free_cell_index:
+                self.free_cell_index[position] = len(self.free_cells)
+                self.free_cells.append(position)
+        elif position in self.free_cell_index:
+            index = self.free_cell_index.pop(position)
+            last = self.free_cells.pop()
+            if last != position:
+                self.free_cells[index] = last
+                self.free_cell_index[last] = index
+
+    def track_changes(self):
+        """
+        Starts tracking the cells that change. The returned set is filled with the positions of all cells whose game
+        object may have changed. The owner of the set clears it after processing the changes.
+
+        :return: The set which will receive the changed positions.
+        """
+        tracker = set()
+        self.change_trackers.append(tracker)
+        return tracker
+
+    def untrack_changes(self, tracker):
+        self.change_trackers.remove(tracker)
 
     def draw(self, canvas):
         for x in range(0, self.width):
@@ -50,18 +140,60 @@ class Board:
                                         fill=self.get_game_object_at(x, y).getColor(), outline="")
 
     def eat_food(self, x, y):
-        self.board[x][y] = GameObject.EMPTY
+        self.set_game_object_at(x, y, GameObject.EMPTY)
         self.spawn_new_food()
 
     def get_copy(self):
-        copy = [[GameObject.EMPTY for x in range(self.width)] for y in range(self.height)]
-        for x in range(self.width):
-            for y in range(self.height):
-                copy[x][y] = self.get_game_object_at(x, y)
+        copy = [column[:] for column in self.board]
+        # draw the snake on top of the copy, only the cells of the snake need to be visited
+        for x, y in self.snake.body_parts:
+            copy[x][y] = GameObject.SNAKE_BODY
+        if 0 <= self.snake.x < self.width and 0 <= self.snake.y < self.height:
+            copy[self.snake.x][self.snake.y] = GameObject.SNAKE_HEAD
         return copy
 
+    def get_view(self):
+        """
+        :return: A read-only view on this board which includes the snake. Unlike get_copy(), no memory is allocated.
+        The view always reflects the current state of the board.
+        """
+        return self.view
+
+    def get_nearest_food(self, x, y):
+        """
+        :return: (x, y) of the food with the smallest Manhattan distance to the given position, None without food.
+        """
+        return self.food_index.nearest(x, y)
+
+    def get_farthest_food(self, x, y):
+        """
+        :return: (x, y) of the food with the largest Manhattan distance to the given position, None without food.
+        """
+        return self.food_index.farthest(x, y)
+
+    def get_distance_to_food(self, x, y):
+        """
+        :return: The number of steps from (x, y) to the nearest food when walking around the walls (the snake is
+        ignored), -1 when no food can be reached.
+        """
+        return self.distance_fields.get_food_field()[x * self.height + y]
+
+    def get_distance_field(self, target, deadline=None):
+        """
+        :param target: (x, y) of the target.
+
+        :param deadline: A time.perf_counter() value after which building the field stops, None to wait for the field.
+        Building a field takes time in the area of the board.
+
+        :return: An array with for every cell the number of steps to the target when walking around the walls (the
+        snake is ignored), -1 for cells from which the target can not be reached. Cell (x, y) is stored at
+        x * height + y. The array must not be changed. None when the deadline passed first, later calls continue
+        building the field.
+        """
+        return self.distance_fields.get_target_field(target, deadline)
+
     def get_copy_without_snake(self):
-        copy = [[GameObject.EMPTY for x in range(self.width)] for y in range(self.height)]
+        copy = [[GameObject.EMPTY for y in range(self.height)] for x in range(self.width)]
         for x in range(self.width):
             for y in range(self.height):
                 if not self.board[x][y] is None:
@@ -84,26 +216,66 @@ class Board:
         self.set_game_object_at(new_x, new_y, gameObjectType)
 
     def get_free_xy(self):
-        new_x = randint(0, self.width - 1)
-        new_y = randint(0, self.height - 1)
-        count = 0
-        # try to find a random position
-        while not (self.get_game_object_at(new_x, new_y) == GameObject.EMPTY) and count < self.max_random_tries:
-            count += 1
-            new_x = randint(0, self.width - 1)
-            new_y = randint(0, self.height - 1)
-
-        # if no random position could be guessed, try a more decent approach
-        if not self.get_game_object_at(new_x, new_y) == GameObject.EMPTY:
-            available = []
-            for x in range(self.width):
-                for y in range(self.height):
-                    if self.get_game_object_at(x, y) == GameObject.EMPTY:
-                        available.append((x, y))
-
-            if len(available) == 0:
-                raise RuntimeError("Congratulations, you broke the game by filling each cell of the board!")
-            else:
-                new_x, new_y = available[randint(0, len(available) - 1)]
+        if len(self.free_cells) == 0:
+            raise RuntimeError("Congratulations, you broke the game by filling each cell of the board!")
+        return self.free_cells[randint(0, len(self.free_cells) - 1)]
+
+
+class BoardView:
+    """
+    Read-only view on a board which can be indexed like the two dimensional array returned by Board.get_copy(), so
+    view[x][y] returns the GameObject at (x, y) including the snake. The objects are looked up on the live board.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.columns = [BoardColumnView(board, x) for x in range(board.width)]
+
+    def __getitem__(self, x):
+        return self.columns[x]
+
+    def __len__(self):
+        return len(self.columns)
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def get_nearest_food(self, x, y):
+        """ See Board.get_nearest_food() """
+        return self.board.get_nearest_food(x, y)
+
+    def get_farthest_food(self, x, y):
+        """ See Board.get_farthest_food() """
+        return self.board.get_farthest_food(x, y)
+
+    def get_distance_to_food(self, x, y):
+        """ See Board.get_distance_to_food() """
+        return self.board.get_distance_to_food(x, y)
+
+    def get_distance_field(self, target, deadline=None):
+        """ See Board.get_distance_field() """
+        return self.board.get_distance_field(target, deadline)
+
+
+class BoardColumnView:
+    """
+    Read-only view on a single column of a board, see BoardView.
+    """
+
+    def __init__(self, board, x):
+        self.board = board
+        self.x = x
+
+    def __getitem__(self, y):
+        if y < 0:
+            y += self.board.height
+        if not 0 <= y < self.board.height:
+            raise IndexError("board index out of range")
+        return self.board.get_game_object_at(self.x, y)
+
+    def __len__(self):
+        return self.board.height
 
-        return new_x, new_y
+    def __iter__(self):
+        for y in range(self.board.height):
+            yield self.board.get_game_object_at(self.x, y)
@@ -0,0 +1,175 @@
+import time
+from array import array
+from collections import OrderedDict, deque
+
+from gameobjects import GameObject
+
+# distance of the cells from which no source can be reached
+unreachable = -1
+
+
+def breadth_first_search(width, height, walls, sources):
+    """
+    Computes the number of steps from the nearest source to every cell, walking around the walls.
+
+    :param walls: A bytearray of width * height values, 1 for the walls. Cell (x, y) is stored at x * height + y.
+
+    :param sources: An iterable of the (x, y) positions to start from.
+
+    :return: An array of width * height distances, unreachable for cells that can not be reached. The distances are
+    kept in an array instead of a list, the garbage collector would visit every cell of a list again and again.
+    """
+    search = FieldSearch(width, height, walls, sources)
+    search.run()
+    return search.distances
+
+
+class FieldSearch:
+    """
+    The breadth first search of breadth_first_search(), which can stop when a deadline passes and continue later. Until
+    the search is complete, the cells it has not reached yet are unreachable.
+    """
+
+    # number of visited cells between two checks of the deadline
+    deadline_check_interval = 1024
+
+    def __init__(self, width, height, walls, sources):
+        """
+        :param walls: Anything that can be indexed like the bytearray of breadth_first_search(), see GridWalls.
+        """
+        self.height = height
+        self.size = width * height
+        self.walls = walls
+        self.distances = array("i", [unreachable]) * self.size
+        self.queue = deque()
+        for x, y in sources:
+            index = x * height + y
+            if self.distances[index] == unreachable:
+                self.distances[index] = 0
+                self.queue.append(index)
+
+    def run(self, deadline=None):
+        """
+        :param deadline: A time.perf_counter() value after which the search stops, None to search until it is done.
+
+        :return: True if the search is complete.
+        """
+        distances = self.distances
+        queue = self.queue
+        walls = self.walls
+        height = self.height
+        size = self.size
+        visited = 0
+        while queue:
+            visited += 1
+            if deadline is not None and visited % self.deadline_check_interval == 0 and time.perf_counter() >= deadline:
+                return False
+            index = queue.popleft()
+            distance = distances[index] + 1
+            y = index % height
+            for neighbor in (index - 1 if y > 0 else -1, index + 1 if y < height - 1 else -1, index - height,
+                             index + height):
+                if 0 <= neighbor < size and distances[neighbor] == unreachable and not walls[neighbor]:
+                    distances[neighbor] = distance
+                    queue.append(neighbor)
+        return True
+
+
+class GridWalls:
+    """
+    The walls of a two dimensional array of game objects, such as Board.get_copy(), indexed like the bytearray of
+    breadth_first_search(). The cells are only looked up when the search reaches them, so no time is spent on the
+    cells of the board a search does not get to.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.height = len(grid[0])
+
+    def __getitem__(self, index):
+        x, y = divmod(index, self.height)
+        return self.grid[x][y] == GameObject.WALL
+
+
+class DistanceFields:
+    """
+    Caches the distances over the walls of a board: one field with the distance to the nearest food and a field per
+    target position. The snake is not taken into account, so the distances are lower bounds of the real number of
+    steps. The fields are built when they are first asked for and thrown away when the food or the walls change. The
+    mask of the walls is built from Board.walls and kept up to date with update_wall().
+    """
+
+    # number of target fields that are kept
+    max_target_fields = 16
+
+    def __init__(self, board):
+        self.board = board
+        self.walls = None
+        self.food_field = None
+        self.target_fields = OrderedDict()
+        # the search for a target field that ran out of time, continued when the field is asked for again
+        self.pending_target = None
+        self.pending_search = None
+
+    def invalidate(self, walls_changed):
+        """
+        :param walls_changed: True if a wall was placed or removed, otherwise only the food changed.
+        """
+        self.food_field = None
+        if walls_changed:
+            self.target_fields.clear()
+            self.pending_target = None
+            self.pending_search = None
+
+    def update_wall(self, x, y, is_wall):
+        """
+        Updates the mask of the walls after a wall was placed or removed and throws the fields away.
+        """
+        if self.walls is not None:
+            self.walls[x * self.board.height + y] = is_wall
+        self.invalidate(True)
+
+    def get_walls(self):
+        if self.walls is None:
+            board = self.board
+            self.walls = bytearray(board.width * board.height)
+            for x, y in board.walls:
+                self.walls[x * board.height + y] = 1
+        return self.walls
+
+    def get_food_field(self):
+        """
+        :return: The array of distances to the nearest food, indexed by x * height + y.
+        """
+        if self.food_field is None:
+            board = self.board
+            self.food_field = breadth_first_search(board.width, board.height, self.get_walls(), board.food_index.food)
+        return self.food_field
+
+    def get_target_field(self, target, deadline=None):
+        """
+        :param deadline: A time.perf_counter() value after which building the field stops, None to wait for the field.
+
+        :return: The array of distances to the given (x, y) position, indexed by x * height + y. None when the deadline
+        passed before the field was built, the next call for the same target continues where this one stopped.
+        """
+        field = self.target_fields.get(target)
+        if field is None:
+            if self.pending_target == target:
+                search = self.pending_search
+            else:
+                board = self.board
+                search = FieldSearch(board.width, board.height, self.get_walls(), [target])
+            if not search.run(deadline):
+                self.pending_target = target
+                self.pending_search = search
+                return None
+            self.pending_target = None
+            self.pending_search = None
+            field = search.distances
+            self.target_fields[target] = field
+            if len(self.target_fields) > self.max_target_fields:
+                self.target_fields.popitem(last=False)
+        else:
+            self.target_fields.move_to_end(target)
+        return field
@@ -0,0 +1,115 @@
+import random
+from collections import namedtuple
+from time import perf_counter
+
+import instrumentation
+
+from snake import Snake
+from board import Board
+
+# Result of a single finished game
+GameResult = namedtuple('GameResult', ['score', 'tics_alive', 'cause_of_death'])
+
+
+class GameEngine:
+    """
+    Runs the game without any user interface. The engine owns a board and a snake and advances them in a tight loop,
+    which makes it suitable for evaluating agents on machines without a display. The default settings are equal to the
+    game settings in main.py.
+    """
+
+    def __init__(self, board_width=25, board_height=25, max_nr_food=1, nr_walls=1, test_config=True,
+                 starvation_tics=-1, print_score=False, seed=None, board_class=Board, agent=None):
+        """
+        :param board_width: The width of the board in cells.
+
+        :param board_height: The height of the board in cells.
+
+        :param max_nr_food: Maximum number of food blocks on the board.
+
+        :param nr_walls: Number of wall blocks on the board, only used when test_config is False.
+
+        :param test_config: Indicates whether the test setup (two fixed walls) needs to be used.
+
+        :param starvation_tics: Number of turns to starve, -1 for disabled.
+
+        :param print_score: Indicates whether the score should be printed to the console whenever the snake dies.
+
+        :param seed: Seed for the random number generator. When None the generator is not reseeded.
+
+        :param board_class: The class used for the board, for instance Board, arrayboard.ArrayBoard or
+        sparseboard.SparseBoard.
+
+        :param agent: The agent controlling the snake, by default the default agent of registry.py.
+        """
+        if seed is not None:
+            random.seed(seed)
+        self.seed = seed
+        self.print_score = print_score
+        self.snake = Snake(board_width, board_height, starvation_tics, agent)
+        # the canvas size is irrelevant without a user interface, so the board gets one pixel per cell
+        self.board = board_class(board_width, board_height, board_width, board_height, self.snake, max_nr_food,
+                                 nr_walls, test_config)
+        self.tics = 0
+        self.results = []
+        # functions called after every turn with the GameResult of the turn (None if the snake is still alive)
+        self.tick_listeners = []
+
+    def tick(self):
+        """
+        Advances the game a single turn. Whenever the snake dies, the result of the game is stored and the snake is
+        reset.
+
+        :return: The GameResult of the game that ended during this turn, None if the snake is still alive.
+        """
+        self.tics += 1
+        profiler = instrumentation.profiler
+        if profiler is not None:
+            start = perf_counter()
+        died, _ = self.snake.update(self.board)
+        result = None
+        if died:
+            result = GameResult(self.snake.score, self.snake.tics_alive, self.snake.cause_of_death)
+            self.results.append(result)
+            self.snake.reset(self.board, self.print_score, True)
+        if profiler is not None:
+            profiler.record("tick", start)
+            profiler.end_tick()
+        for listener in self.tick_listeners:
+            listener(result)
+        return result
+
+    def run(self, n_ticks):
+        """
+        Advances the game a given number of turns.
+
+        :param n_ticks: The number of turns to play.
+
+        :return: A list of GameResults of all games that ended during these turns.
+        """
+        finished = []
+        for i in range(n_ticks):
+            result = self.tick()
+            if result is not None:
+                finished.append(result)
+        return finished
+
+    def run_games(self, n_games, max_ticks=-1):
+        """
+        Plays until a given number of games have ended.
+
+        :param n_games: The number of games to play.
+
+        :param max_ticks: Maximum number of turns to play in total, -1 for no limit. This prevents the engine from
+        running forever when an agent manages to survive indefinitely.
+
+        :return: A list of GameResults of the games played.
+        """
+        finished = []
+        ticks = 0
+        while len(finished) < n_games and (max_ticks == -1 or ticks < max_ticks):
+            result = self.tick()
+            ticks += 1
+            if result is not None:
+                finished.append(result)
+        return finished
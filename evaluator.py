@@ -0,0 +1,103 @@
+import argparse
+from collections import Counter, namedtuple
+from multiprocessing import Pool, cpu_count
+
+from engine import GameEngine
+
+# One row of the result table, every row describes a single game
+EvaluationRow = namedtuple('EvaluationRow', ['seed', 'score', 'tics_alive', 'cause_of_death'])
+
+
+def play_game(task):
+    """
+    Plays a single game with its own board, snake and agent. This function is executed by the worker processes.
+
+    :param task: A tuple containing the seed of the game, the maximum number of turns and a dict with the settings
+    passed to the GameEngine.
+
+    :return: The EvaluationRow of the game. When the game did not end within the maximum number of turns, the cause of
+    death is "max_ticks".
+    """
+    seed, max_ticks, settings = task
+    engine = GameEngine(seed=seed, **settings)
+    results = engine.run_games(1, max_ticks)
+    if results:
+        return EvaluationRow(seed, results[0].score, results[0].tics_alive, results[0].cause_of_death)
+    return EvaluationRow(seed, engine.snake.score, engine.snake.tics_alive, "max_ticks")
+
+
+def evaluate(seeds, processes=None, max_ticks=-1, **settings):
+    """
+    Plays one game per seed, spreading the games over a pool of processes. Games are independent, so the throughput
+    scales with the number of processes.
+
+    :param seeds: An iterable of seeds, one game is played for each seed.
+
+    :param processes: The number of worker processes, by default the number of cores.
+
+    :param max_ticks: Maximum number of turns per game, -1 for no limit.
+
+    :param settings: Settings passed to the GameEngine of each game (board_width, nr_walls, ...).
+
+    :return: A list of EvaluationRows ordered by seed.
+    """
+    seeds = list(seeds)
+    if processes is None:
+        processes = cpu_count()
+    tasks = [(seed, max_ticks, settings) for seed in seeds]
+    # a few chunks per process keeps the pool busy without paying the inter-process overhead for every game
+    chunk_size = max(1, len(tasks) // (processes * 4))
+    with Pool(processes) as pool:
+        rows = list(pool.imap_unordered(play_game, tasks, chunk_size))
+    return sorted(rows, key=lambda row: row.seed)
+
+
+def summarize(rows):
+    """
+    Summarizes a result table.
+
+    :param rows: A list of EvaluationRows.
+
+    :return: A dict with the number of games, the mean, minimum and maximum score, the mean number of turns alive and
+    the number of deaths per cause.
+    """
+    scores = [row.score for row in rows]
+    return {
+        "games": len(rows),
+        "mean_score": sum(scores) / len(rows) if rows else 0,
+        "min_score": min(scores, default=0),
+        "max_score": max(scores, default=0),
+        "mean_tics_alive": sum(row.tics_alive for row in rows) / len(rows) if rows else 0,
+        "causes_of_death": dict(Counter(row.cause_of_death for row in rows))
+    }
+
+
+def print_table(rows):
+    print("{:>10} {:>8} {:>12}  {}".format("seed", "score", "tics_alive", "cause_of_death"))
+    for row in rows:
+        print("{:>10} {:>8} {:>12}  {}".format(row.seed, row.score, row.tics_alive, row.cause_of_death))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate the agent by playing many games in parallel.")
+    parser.add_argument("--games", type=int, default=100, help="number of games to play")
+    parser.add_argument("--first-seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--processes", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--max-ticks", type=int, default=-1, help="maximum number of turns per game")
+    parser.add_argument("--board-width", type=int, default=25)
+    parser.add_argument("--board-height", type=int, default=25)
+    parser.add_argument("--food", type=int, default=1, help="maximum number of food blocks")
+    parser.add_argument("--walls", type=int, default=1, help="number of random walls when using --random-walls")
+    parser.add_argument("--random-walls", action="store_true", help="spawn random walls instead of the test config")
+    parser.add_argument("--starvation-tics", type=int, default=-1)
+    args = parser.parse_args()
+
+    rows = evaluate(range(args.first_seed, args.first_seed + args.games), args.processes, args.max_ticks,
+                    board_width=args.board_width, board_height=args.board_height, max_nr_food=args.food,
+                    nr_walls=args.walls, test_config=not args.random_walls, starvation_tics=args.starvation_tics)
+    print_table(rows)
+    print(summarize(rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import heapq
+
+# below this number of food blocks, queries simply check every food block
+linear_search_limit = 32
+
+
+class FoodIndex:
+    """
+    Keeps track of the positions of the food on a board and answers nearest and farthest food queries by Manhattan
+    distance. For the nearest food, the food is divided over square buckets which are searched in rings around the
+    position. For the farthest food, four heaps hold the food ordered by x + y and x - y, the farthest food always
+    has one of the extreme values. Removed food stays in the heaps until it reaches the top. Ties are broken by the
+    smallest (x, y), like a scan of the board column by column would.
+    """
+
+    def __init__(self, width, height, bucket_size=8):
+        self.width = width
+        self.height = height
+        self.bucket_size = bucket_size
+        self.food = set()
+        self.buckets = {}
+        # heaps of (key, x, y) with key -(x + y), x + y, -(x - y) and x - y
+        self.heaps = [[], [], [], []]
+
+    def __len__(self):
+        return len(self.food)
+
+    def __contains__(self, position):
+        return position in self.food
+
+    def add(self, x, y):
+        position = (x, y)
+        if position in self.food:
+            return
+        self.food.add(position)
+        bucket = (x // self.bucket_size, y // self.bucket_size)
+        self.buckets.setdefault(bucket, set()).add(position)
+        if sum(len(heap) for heap in self.heaps) > 8 * len(self.food) + 64:
+            self.rebuild_heaps()
+        else:
+            for heap, key in zip(self.heaps, self.heap_keys(x, y)):
+                heapq.heappush(heap, (key, x, y))
+
+    def discard(self, x, y):
+        position = (x, y)
+        if position not in self.food:
+            return
+        self.food.discard(position)
+        bucket = (x // self.bucket_size, y // self.bucket_size)
+        self.buckets[bucket].discard(position)
+        if not self.buckets[bucket]:
+            del self.buckets[bucket]
+
+    def update(self, x, y, is_food):
+        if is_food:
+            self.add(x, y)
+        else:
+            self.discard(x, y)
+
+    @staticmethod
+    def heap_keys(x, y):
+        return -(x + y), x + y, -(x - y), x - y
+
+    def rebuild_heaps(self):
+        self.heaps = [[], [], [], []]
+        for x, y in self.food:
+            for heap, key in zip(self.heaps, self.heap_keys(x, y)):
+                heap.append((key, x, y))
+        for heap in self.heaps:
+            heapq.heapify(heap)
+
+    def nearest(self, x, y):
+        """
+        :return: (x, y) of the food nearest to the given position, None when there is no food.
+        """
+        if len(self.food) <= linear_search_limit:
+            return min(self.food, key=lambda food: (abs(food[0] - x) + abs(food[1] - y), food), default=None)
+
+        size = self.bucket_size
+        center_x, center_y = x // size, y // size
+        max_ring = max(center_x, center_y, (self.width - 1) // size - center_x, (self.height - 1) // size - center_y)
+        best = None
+        best_key = None
+        for ring in range(max_ring + 1):
+            for bucket_x in range(center_x - ring, center_x + ring + 1):
+                # the buckets on the border of the ring: all of the first and last column, the top and bottom of others
+                if bucket_x == center_x - ring or bucket_x == center_x + ring:
+                    bucket_ys = range(center_y - ring, center_y + ring + 1)
+                else:
+                    bucket_ys = (center_y - ring, center_y + ring) if ring > 0 else (center_y,)
+                for bucket_y in bucket_ys:
+                    for food in self.buckets.get((bucket_x, bucket_y), ()):
+                        key = (abs(food[0] - x) + abs(food[1] - y), food)
+                        if best_key is None or key < best_key:
+                            best_key = key
+                            best = food
+            # every cell in the next ring is more than ring * size cells away
+            if best_key is not None and best_key[0] <= ring * size:
+                break
+        return best
+
+    def farthest(self, x, y):
+        """
+        :return: (x, y) of the food farthest from the given position, None when there is no food.
+        """
+        best = None
+        best_key = None
+        for heap in self.heaps:
+            while heap and (heap[0][1], heap[0][2]) not in self.food:
+                heapq.heappop(heap)
+            if heap:
+                food = (heap[0][1], heap[0][2])
+                # largest distance first, then the smallest position
+                key = (-(abs(food[0] - x) + abs(food[1] - y)), food)
+                if best_key is None or key < best_key:
+                    best_key = key
+                    best = food
+        return best
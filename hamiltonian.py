@@ -0,0 +1,450 @@
+from collections import deque
+
+from bitboard import BitBoard
+from gameobjects import GameObject
+from move import Move, transitions
+
+# cycles that have been built, by board width, height and wall positions
+cycle_cache = {}
+
+neighbor_offsets = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+
+
+def build_cycle(width, height, walls):
+    """
+    Builds a closed path through (nearly) all cells of the board that are not a wall. The board is divided in blocks of
+    2x2 cells, every block without walls starts as a small cycle around its four cells and the cycles of neighboring
+    blocks are merged along a spanning tree of the blocks. Cells that are not covered by a block (the last row or column
+    of an odd sized board and the free cells of blocks with a wall) are then inserted in pairs wherever the cycle runs
+    along them.
+
+    :param width: The width of the board.
+
+    :param height: The height of the board.
+
+    :param walls: A set with the (x, y) positions of the walls.
+
+    :return: A list with the positions of the cycle in order, every position is next to the previous one and the last
+    position is next to the first one. Empty when no block is free of walls.
+    """
+    block_width = width // 2
+    block_height = height // 2
+    free_blocks = set()
+    for i in range(block_width):
+        for j in range(block_height):
+            cells = [(2 * i, 2 * j), (2 * i + 1, 2 * j), (2 * i, 2 * j + 1), (2 * i + 1, 2 * j + 1)]
+            if not any(cell in walls for cell in cells):
+                free_blocks.add((i, j))
+    if not free_blocks:
+        return []
+
+    edges = {}
+
+    def connect(a, b):
+        edges.setdefault(a, set()).add(b)
+        edges.setdefault(b, set()).add(a)
+
+    def disconnect(a, b):
+        edges[a].discard(b)
+        edges[b].discard(a)
+
+    # spanning tree over the largest group of connected blocks, found with a depth first search from every block
+    visited = set()
+    largest_tree = []
+    for root in sorted(free_blocks):
+        if root in visited:
+            continue
+        visited.add(root)
+        tree = [(root, None)]
+        stack = [root]
+        while stack:
+            i, j = stack.pop()
+            for di, dj in neighbor_offsets:
+                block = (i + di, j + dj)
+                if block in free_blocks and block not in visited:
+                    visited.add(block)
+                    tree.append((block, (i, j)))
+                    stack.append(block)
+        if len(tree) > len(largest_tree):
+            largest_tree = tree
+
+    for (i, j), parent in largest_tree:
+        x, y = 2 * i, 2 * j
+        connect((x, y), (x + 1, y))
+        connect((x + 1, y), (x + 1, y + 1))
+        connect((x + 1, y + 1), (x, y + 1))
+        connect((x, y + 1), (x, y))
+    for (i, j), parent in largest_tree:
+        if parent is None:
+            continue
+        # merge the cycle of the block with the cycle of its parent: the two facing sides are removed and replaced by
+        # two edges crossing between the blocks
+        (pi, pj) = parent
+        a, b = min((i, j), (pi, pj)), max((i, j), (pi, pj))
+        if a[1] == b[1]:
+            # a is left of b
+            a_top, a_bottom = (2 * a[0] + 1, 2 * a[1]), (2 * a[0] + 1, 2 * a[1] + 1)
+            b_top, b_bottom = (2 * b[0], 2 * b[1]), (2 * b[0], 2 * b[1] + 1)
+        else:
+            # a is above b
+            a_top, a_bottom = (2 * a[0], 2 * a[1] + 1), (2 * a[0] + 1, 2 * a[1] + 1)
+            b_top, b_bottom = (2 * b[0], 2 * b[1]), (2 * b[0] + 1, 2 * b[1])
+        disconnect(a_top, a_bottom)
+        disconnect(b_top, b_bottom)
+        connect(a_top, b_top)
+        connect(a_bottom, b_bottom)
+
+    # insert the uncovered cells in pairs: an edge a-b with free cells c next to a and d next to b becomes a-c-d-b
+    def is_uncovered(cell):
+        return 0 <= cell[0] < width and 0 <= cell[1] < height and cell not in walls and cell not in edges
+
+    changed = True
+    while changed:
+        changed = False
+        for a in list(edges):
+            for b in list(edges[a]):
+                if b not in edges[a]:
+                    # removed by an earlier insertion in this pass
+                    continue
+                for dx, dy in neighbor_offsets:
+                    c = (a[0] + dx, a[1] + dy)
+                    d = (b[0] + dx, b[1] + dy)
+                    if c == b or d == a or not is_uncovered(c) or not is_uncovered(d):
+                        continue
+                    disconnect(a, b)
+                    connect(a, c)
+                    connect(c, d)
+                    connect(d, b)
+                    changed = True
+                    break
+
+    # walk along the cycle
+    start = min(edges)
+    cycle = [start]
+    previous = None
+    current = start
+    while True:
+        following = [cell for cell in edges[current] if cell != previous]
+        next_cell = following[0] if previous is not None else min(edges[current])
+        if next_cell == start:
+            break
+        cycle.append(next_cell)
+        previous, current = current, next_cell
+    return cycle
+
+
+def find_path(start, is_goal, can_enter, width, height):
+    """
+    Breadth first search from the start cell to the nearest goal cell.
+
+    :param is_goal: Function which tells whether an (x, y) position is a goal, the goal does not have to be enterable.
+
+    :param can_enter: Function which tells whether the search may pass through an (x, y) position.
+
+    :return: The list of positions after the start up to and including the goal, empty when no goal can be reached.
+    """
+    parents = {start: None}
+    queue = deque([start])
+    while queue:
+        current = queue.popleft()
+        for dx, dy in neighbor_offsets:
+            cell = (current[0] + dx, current[1] + dy)
+            if cell in parents or not (0 <= cell[0] < width and 0 <= cell[1] < height):
+                continue
+            parents[cell] = current
+            if is_goal(cell):
+                path = []
+                while cell != start:
+                    path.append(cell)
+                    cell = parents[cell]
+                return path[::-1]
+            if can_enter(cell):
+                queue.append(cell)
+    return []
+
+
+def get_cycle(width, height, walls):
+    """
+    :return: The cycle of build_cycle(), taken from the cache when it was built before for the same board.
+    """
+    key = (width, height, frozenset(walls))
+    if key not in cycle_cache:
+        cycle_cache[key] = build_cycle(width, height, walls)
+    return cycle_cache[key]
+
+
+class HamiltonianAgent:
+    """
+    Agent which follows a fixed cycle through the board. As long as the body of the snake lies on the part of the cycle
+    between the tail and the head, following the cycle can never kill the snake. When the snake is short, it takes
+    shortcuts towards the food, but only to cells on the cycle before its tail. Food on a cell which is not on the cycle
+    is eaten with a detour over other cells off the cycle. Besides the first move, finding new food after eating and
+    planning such a detour, every move takes constant time.
+    """
+
+    # the snake only takes shortcuts while it covers less than this part of the cycle
+    shortcut_fraction = 0.5
+    # number of cells kept free between the head and the tail when taking a shortcut, covers the tail standing still
+    # while the snake grows
+    safety_margin = 4
+
+    def __init__(self):
+        self.width = None
+        self.height = None
+        self.cycle = []
+        self.index = []
+        self.food = None
+        self.last_index = -1
+        # positions still to move to on the way to food which is not on the cycle
+        self.detour = []
+        # number of moves the snake has been waiting for a detour to the food
+        self.food_wait = 0
+        # score during the previous move, a higher score means the snake grows during this move
+        self.previous_score = 0
+        # number of body parts on cells which are not on the cycle, and the head and tail it was counted for
+        self.off_cycle_parts = 0
+        self.previous_head = None
+        self.previous_tail = None
+
+    def build(self, board):
+        self.width = len(board)
+        self.height = len(board[0])
+        # the food and the last cycle index refer to the previous board
+        self.food = None
+        self.last_index = -1
+        self.detour = []
+        self.food_wait = 0
+        self.previous_head = None
+        walls = set()
+        for x in range(self.width):
+            for y in range(self.height):
+                if board[x][y] == GameObject.WALL:
+                    walls.add((x, y))
+        self.cycle = get_cycle(self.width, self.height, walls)
+        # flat array with the index of every cell in the cycle, -1 for cells not on the cycle
+        self.index = [-1] * (self.width * self.height)
+        for i, (x, y) in enumerate(self.cycle):
+            self.index[x * self.height + y] = i
+
+    def get_index(self, position):
+        return self.index[position[0] * self.height + position[1]]
+
+    def find_food(self, board, head_index):
+        """
+        Scans the board for the food block that comes first on the cycle after the given cycle index.
+        """
+        self.food = None
+        self.food_wait = 0
+        best = None
+        for x in range(self.width):
+            for y in range(self.height):
+                if board[x][y] == GameObject.FOOD:
+                    index = self.index[x * self.height + y]
+                    distance = (index - head_index) % len(self.cycle) if index != -1 and head_index != -1 else \
+                        len(self.cycle)
+                    if best is None or distance < best:
+                        best = distance
+                        self.food = (x, y)
+
+    def count_off_cycle(self, head_position, body_parts):
+        """
+        Counts the body parts on cells which are not on the cycle. While such a part leaves, the last body part on the
+        cycle stays in place, so every one of them takes a cell from the free part of the cycle ahead of the head. When
+        the body followed the head since the previous move, the count is updated in constant time.
+        """
+        if body_parts and body_parts[0] == self.previous_head:
+            # the previous head became a body part and, unless the snake grew, the previous tail left
+            if self.get_index(self.previous_head) == -1:
+                self.off_cycle_parts += 1
+            if self.previous_tail is not None and body_parts[-1] != self.previous_tail and \
+                    self.get_index(self.previous_tail) == -1:
+                self.off_cycle_parts -= 1
+        else:
+            self.off_cycle_parts = sum(1 for part in body_parts if self.get_index(part) == -1)
+        self.previous_head = head_position
+        self.previous_tail = body_parts[-1] if body_parts else None
+        return self.off_cycle_parts
+
+    def is_safe_detour(self, board, head_position, body_parts, detour):
+        """
+        Follows the detour with the movement rules of the snake, which grows after eating the food. The detour is safe
+        when all body parts on the cycle lie behind the cell where the head enters the cycle again, so that following
+        the cycle from there can not run into the body, when the free part of the cycle ahead of the head is longer than
+        the number of body parts off the cycle, see count_off_cycle(), and when the head can still reach the tail.
+        """
+        body = list(body_parts)
+        size = len(body)
+        head = head_position
+        for cell in detour:
+            body.insert(0, head)
+            del body[size:]
+            head = cell
+            if cell == self.food:
+                size += 1
+        cycle_length = len(self.cycle)
+        head_index = self.get_index(head)
+        on_cycle = [index for index in map(self.get_index, body) if index != -1]
+        # on_cycle[-1] is the body part on the cycle closest to the tail, the others have to lie between it and the head
+        if on_cycle and any((head_index - index) % cycle_length > (head_index - on_cycle[-1]) % cycle_length
+                            for index in on_cycle):
+            return False
+        free_ahead = (on_cycle[-1] - head_index) % cycle_length if on_cycle else cycle_length
+        if free_ahead - (len(body) - len(on_cycle)) <= 1:
+            return False
+        return BitBoard.from_board(board).can_reach_tail(head, body)
+
+    def plan_detour(self, board, head_position, body_parts, is_free):
+        """
+        Plans a detour to food which is not on the cycle. The detour leaves the cycle at the head, reaches the food over
+        cells off the cycle and enters the cycle again at a cell ahead of the head, see is_safe_detour(). When the food
+        has not been eaten for two laps along the cycle, the body lies the same way every lap and it never will be, for
+        instance when the food lies in a dead end or the body off the cycle keeps the head from it. The snake then takes
+        the shortest path to the food anyway, as the game does not continue otherwise.
+
+        :param is_free: Function which tells whether the head can move to (x, y).
+
+        :return: The list of positions of the detour, empty when there is no detour from the head.
+        """
+        self.food_wait += 1
+        if self.food_wait > 2 * len(self.cycle):
+            return find_path(head_position, lambda cell: cell == self.food, lambda cell: is_free(*cell), self.width,
+                             self.height)
+        if self.get_index(head_position) == -1:
+            if self.last_index == -1:
+                # a new snake placed off the cycle first finds its way onto it
+                return find_path(head_position, lambda cell: self.get_index(cell) != -1 and is_free(*cell),
+                                 lambda cell: is_free(*cell), self.width, self.height)
+            return []
+        if self.get_index(self.food) != -1:
+            return []
+
+        def is_free_off_cycle(cell):
+            return self.get_index(cell) == -1 and is_free(*cell)
+
+        to_food = find_path(head_position, lambda cell: cell == self.food, is_free_off_cycle, self.width, self.height)
+        if to_food:
+            used = set(to_food)
+            rejected = set()
+            while True:
+                # the nearest cycle cell to get back onto which has not been rejected yet
+                back = find_path(self.food, lambda cell: self.get_index(cell) != -1 and is_free(*cell) and
+                                 cell not in rejected, lambda cell: is_free_off_cycle(cell) and cell not in used,
+                                 self.width, self.height)
+                if not back:
+                    break
+                if self.is_safe_detour(board, head_position, body_parts, to_food + back):
+                    return to_food + back
+                rejected.add(back[-1])
+        return []
+
+    def get_move(self, board, score, turns_alive, turns_to_starve, direction, head_position, body_parts):
+        if self.width != len(board) or self.height != len(board[0]):
+            self.build(board)
+        if not self.cycle:
+            return Move.STRAIGHT
+
+        cycle_length = len(self.cycle)
+        head_index = self.get_index(head_position)
+        if head_index != -1:
+            self.last_index = head_index
+        elif not body_parts:
+            # a new snake, placed on a cell which is not on the cycle
+            self.last_index = -1
+        # cycle index the distances are measured from, the last cycle cell the head visited when it left the cycle
+        reference = self.last_index
+        if self.food is None or board[self.food[0]][self.food[1]] != GameObject.FOOD:
+            self.find_food(board, reference)
+        food_index = self.get_index(self.food) if self.food is not None else -1
+        off_cycle = self.count_off_cycle(head_position, body_parts)
+        tail_index = reference
+        # the tail may lie on a cell off the cycle after a detour, then the last body part on the cycle counts as tail
+        for part in reversed(body_parts):
+            tail_index = self.get_index(part)
+            if tail_index != -1:
+                break
+        may_shortcut = len(body_parts) + 1 < cycle_length * self.shortcut_fraction
+        # the tail moves away during this move, unless the snake has just eaten and grows
+        leaving_tail = body_parts[-1] if body_parts and score <= self.previous_score else None
+        self.previous_score = score
+        # number of cells on the cycle ahead of the head before the tail is reached, the body lies behind the head.
+        # The tail on the cycle stays in place while the body parts off the cycle leave, which costs a cell each
+        if reference == -1 or tail_index == -1 or not body_parts:
+            free_ahead = cycle_length
+        else:
+            free_ahead = (tail_index - reference) % cycle_length - off_cycle
+            if leaving_tail is not None and self.get_index(leaving_tail) == tail_index:
+                # the cell of the tail is free by the time the head gets there
+                free_ahead += 1
+
+        def is_free(x, y):
+            return 0 <= x < self.width and 0 <= y < self.height and \
+                (board[x][y] == GameObject.EMPTY or board[x][y] == GameObject.FOOD)
+
+        def can_jump(index):
+            # moving to a cell further ahead on the cycle keeps the body behind the head, as long as the cell is not
+            # too close to the tail
+            distance = (index - reference) % cycle_length
+            return 0 < distance < free_ahead - self.safety_margin or (distance == 1 and free_ahead > 1)
+
+        if not self.detour and self.food is not None:
+            self.detour = self.plan_detour(board, head_position, body_parts, is_free)
+        if self.detour:
+            target = self.detour.pop(0)
+            for move, (dx, dy, new_direction) in zip((Move.LEFT, Move.STRAIGHT, Move.RIGHT),
+                                                     transitions[direction.value]):
+                if (head_position[0] + dx, head_position[1] + dy) == target and is_free(*target):
+                    return move
+            # the detour is blocked, the snake returns to the cycle
+            self.detour = []
+
+        best_move = None
+        best_score = None
+        free_move = None
+        for move, (dx, dy, new_direction) in zip((Move.LEFT, Move.STRAIGHT, Move.RIGHT), transitions[direction.value]):
+            x, y = head_position[0] + dx, head_position[1] + dy
+            if not is_free(x, y) and (x, y) != leaving_tail:
+                continue
+            free_move = move
+            index = self.index[x * self.height + y]
+
+            if index == -1:
+                # cells off the cycle are only entered on a detour
+                continue
+
+            if reference == -1:
+                move_score = 0
+            else:
+                distance = (index - reference) % cycle_length
+                if not can_jump(index):
+                    continue
+                if may_shortcut and food_index != -1:
+                    # a shortcut may not pass the food
+                    if distance > (food_index - reference) % cycle_length:
+                        continue
+                    move_score = (food_index - index) % cycle_length
+                else:
+                    move_score = distance
+            if best_score is None or move_score < best_score:
+                best_score = move_score
+                best_move = move
+
+        if best_move is not None:
+            return best_move
+        # no cell on the cycle can be entered, any free cell is better than dying
+        return free_move if free_move is not None else Move.STRAIGHT
+
+    def should_redraw_board(self):
+        return True
+
+    def should_copy_board(self):
+        return False
+
+    def should_grow_on_food_collision(self):
+        return True
+
+    def on_die(self, head_position, board, score, body_parts):
+        self.food = None
+        self.last_index = -1
+        self.detour = []
+        self.food_wait = 0
+        self.previous_head = None
@@ -0,0 +1,151 @@
+import json
+from time import perf_counter
+
+# the active TickProfiler, None when instrumentation is disabled. The game only checks this variable, so disabled
+# instrumentation costs a single comparison per phase.
+profiler = None
+
+# every power of two is divided in sub_buckets buckets, so percentiles are accurate within 1 / sub_buckets
+sub_buckets = 4
+sub_bucket_bits = 2
+
+
+class PhaseHistogram:
+    """
+    Histogram of the durations of a single phase, with logarithmic buckets of durations in nanoseconds.
+    """
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, duration):
+        """
+        :param duration: The duration in nanoseconds.
+        """
+        if duration < sub_buckets:
+            bucket = duration
+        else:
+            bits = duration.bit_length()
+            mantissa = (duration >> (bits - sub_bucket_bits - 1)) & (sub_buckets - 1)
+            bucket = sub_buckets * (bits - sub_bucket_bits) + mantissa
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+    @staticmethod
+    def bucket_upper_bound(bucket):
+        if bucket < sub_buckets:
+            return bucket
+        bits = bucket // sub_buckets + sub_bucket_bits
+        mantissa = bucket % sub_buckets
+        return ((sub_buckets + mantissa + 1) << (bits - sub_bucket_bits - 1)) - 1
+
+    def percentile(self, q):
+        """
+        :param q: The percentile, between 0 and 100.
+
+        :return: An upper bound of the duration at the given percentile in nanoseconds, never more than the maximum.
+        """
+        if self.count == 0:
+            return 0
+        rank = q / 100 * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self.bucket_upper_bound(bucket), self.max)
+        return self.max
+
+
+class TickProfiler:
+    """
+    Measures the duration of the phases of every turn. The histograms cover the turns since the previous report, every
+    report_every turns the summary is given to the callback and the histograms start over.
+    """
+
+    def __init__(self, report_every=1000, callback=None):
+        """
+        :param report_every: The number of turns between two reports, 0 to disable periodic reports.
+
+        :param callback: Function called with the summary (see summary()) of every report.
+        """
+        self.report_every = report_every
+        self.callback = callback
+        self.phases = {}
+        self.ticks = 0
+
+    def record(self, phase, start):
+        """
+        Records the duration of a phase.
+
+        :param phase: The name of the phase.
+
+        :param start: The value of perf_counter() at the start of the phase.
+
+        :return: The current value of perf_counter(), which can be used as start of the next phase.
+        """
+        now = perf_counter()
+        histogram = self.phases.get(phase)
+        if histogram is None:
+            histogram = self.phases[phase] = PhaseHistogram()
+        histogram.add(int((now - start) * 1e9))
+        return now
+
+    def end_tick(self):
+        self.ticks += 1
+        if self.report_every and self.ticks % self.report_every == 0:
+            if self.callback is not None:
+                self.callback(self.summary())
+            self.phases = {}
+
+    def summary(self):
+        """
+        :return: A dict with for every phase the number of measurements and the mean, p50, p95, p99 and maximum
+        duration in milliseconds.
+        """
+        result = {}
+        for phase, histogram in self.phases.items():
+            result[phase] = {
+                "count": histogram.count,
+                "mean_ms": histogram.total / histogram.count / 1e6,
+                "p50_ms": histogram.percentile(50) / 1e6,
+                "p95_ms": histogram.percentile(95) / 1e6,
+                "p99_ms": histogram.percentile(99) / 1e6,
+                "max_ms": histogram.max / 1e6
+            }
+        return result
+
+    def export(self, path):
+        """ Writes the current summary to a JSON file """
+        with open(path, "w") as file:
+            json.dump({"ticks": self.ticks, "phases": self.summary()}, file, indent=2)
+
+
+def print_summary(summary):
+    print("{:<12} {:>8} {:>10} {:>10} {:>10} {:>10} {:>10}".format("phase", "count", "mean ms", "p50 ms", "p95 ms",
+                                                                   "p99 ms", "max ms"))
+    for phase, stats in sorted(summary.items()):
+        print("{:<12} {:>8} {:>10.4f} {:>10.4f} {:>10.4f} {:>10.4f} {:>10.4f}".format(
+            phase, stats["count"], stats["mean_ms"], stats["p50_ms"], stats["p95_ms"], stats["p99_ms"],
+            stats["max_ms"]))
+
+
+def enable(report_every=1000, callback=print_summary):
+    """
+    Enables the instrumentation of the game.
+
+    :return: The new TickProfiler.
+    """
+    global profiler
+    profiler = TickProfiler(report_every, callback)
+    return profiler
+
+
+def disable():
+    global profiler
+    profiler = None
@@ -1,6 +1,10 @@
 from tkinter import *
+from time import perf_counter
+import threading
+import instrumentation
 from snake import Snake
 from board import Board
+from renderer import BoardRenderer
 
 
 root = None
@@ -11,6 +15,8 @@ canvas_height = 800
 
 tics_per_second = 4
 previous_text_drawn = False
+# indicates whether game_loop is scheduled, it stops while the slider is at 0
+game_loop_scheduled = False
 
 """ BEGIN GAME SETTINGS """
 # Board width and height
@@ -26,24 +32,49 @@ test_config = True
 starvation_tics = -1
 # indicates whether when not redrawing the board, the score should be printed to the console.
 print_score_not_on_non_redraw = True
+# Number of turns between two reports of the time spent per phase of a turn, 0 to disable the instrumentation
+instrumentation_report_every = 0
+# Indicates whether the game runs in turbo mode: the turns are played as fast as possible on a separate thread and the
+# board is drawn frames_per_second times per second. The slider only pauses the game when set to 0
+turbo_mode = False
+frames_per_second = 30
 """ END GAME SETTINGS """
 
 # game objects
 snake = None
 board = None
+renderer = None
+
+# turbo mode: simulation_lock is held while a turn is played, frame_lock while the frame is handed to the user interface
+simulation_lock = threading.Lock()
+frame_lock = threading.Lock()
+# set while the simulation thread may play turns
+simulation_running = threading.Event()
+# colors of the cells that changed since the last drawn frame, whether the board should be redrawn and the number of
+# turns played since then, all guarded by frame_lock
+frame_colors = {}
+frame_redraw_board = True
+turns_played = 0
 
 
 def callback():
-    update()
+    if turbo_mode:
+        with simulation_lock:
+            redraw_board = step()
+            hand_over_frame(redraw_board)
+    else:
+        update()
 
 
 def main():
-    global root, canvas, canvas_height, canvas_width, board, snake, scale
+    global root, canvas, canvas_height, canvas_width, board, snake, scale, renderer
+    if instrumentation_report_every > 0:
+        instrumentation.enable(instrumentation_report_every)
     root = Tk()
     root.title("Snake")
     canvas = Canvas(root, width=canvas_width, height=canvas_height)
     scale = Scale(root, from_=0, to=500, orient=HORIZONTAL, length=canvas_width, tickinterval=25,
-                  label="Turns Per Second")
+                  label="Turns Per Second" if not turbo_mode else "Turbo mode, 0 pauses the game")
     scale.set(tics_per_second)
     scale.bind("<ButtonRelease-1>", on_slider_update)
     canvas.pack()
@@ -53,44 +84,143 @@ def main():
     snake = Snake(board_width, board_height, starvation_tics)
     board = Board(board_width, board_height, canvas_width, canvas_height, snake, food_blocks_max, wall_blocks_max,
                   test_config)
-    board.draw(canvas)
-    canvas.after(int(1000 / tics_per_second), game_loop)
+    renderer = BoardRenderer(board, canvas)
+    if turbo_mode:
+        if tics_per_second > 0:
+            simulation_running.set()
+        threading.Thread(target=simulation_loop, daemon=True).start()
+        canvas.after(int(1000 / frames_per_second), frame_loop)
+    else:
+        schedule_game_loop()
     mainloop()
 
 
+def schedule_game_loop():
+    global game_loop_scheduled
+    if tics_per_second > 0 and not game_loop_scheduled:
+        game_loop_scheduled = True
+        canvas.after(int(1000 / tics_per_second), game_loop)
+
+
 def game_loop():
-    global canvas, tics_per_second
+    global game_loop_scheduled
+    game_loop_scheduled = False
+    # while the slider is at 0 the loop stops, on_slider_update() starts it again
     if tics_per_second > 0:
         update()
-        canvas.after(int(1000 / tics_per_second), game_loop)
-    else:
-        canvas.after(int(1000), game_loop)
+        schedule_game_loop()
 
 
-def update():
-    global tics_per_second, board, snake, canvas, previous_text_drawn, print_score_not_on_non_redraw
+def step():
+    """
+    Plays a single turn.
+
+    :return: True if the board should be redrawn.
+    """
+    profiler = instrumentation.profiler
+    if profiler is not None:
+        start = perf_counter()
 
     # update gamestate
     result = snake.update(board)
     if result[0]:
         snake.reset(board, result[1], print_score_not_on_non_redraw)
+    if profiler is not None:
+        profiler.record("tick", start)
+    return result[1]
 
-    if result[1]:
-        # clear canvas
-        canvas.delete("all")
-        # draw new state
-        board.draw(canvas)
+
+def update():
+    redraw_board = step()
+    profiler = instrumentation.profiler
+    if profiler is not None:
+        start = perf_counter()
+    draw(redraw_board, renderer.collect_changes() if redraw_board else {})
+    if profiler is not None:
+        profiler.record("draw", start)
+        profiler.end_tick()
+
+
+def draw(redraw_board, colors):
+    """
+    Draws the board, or the message that the board is not redrawn.
+
+    :param colors: The colors of the cells that changed, see BoardRenderer.collect_changes().
+    """
+    global previous_text_drawn
+    if redraw_board:
+        if previous_text_drawn:
+            canvas.delete("message")
+            renderer.show()
+        # draw the cells that changed
+        renderer.apply_changes(colors)
         previous_text_drawn = False
     elif not previous_text_drawn:
         previous_text_drawn = True
-        canvas.delete("all")
+        renderer.hide()
         canvas.create_text(canvas_width/2, canvas_height/2, fill="darkblue", font="Times 20 bold", justify="center",
-                           text="Currently not redrawing the board \nStill use slider to determine game speed!!!")
+                           text="Currently not redrawing the board \nStill use slider to determine game speed!!!",
+                           tags="message")
+
+
+def simulation_loop():
+    """ Plays turns as fast as possible in turbo mode, runs on its own thread """
+    next_frame = perf_counter()
+    # turns played since the last frame was handed over
+    turns = 0
+    while True:
+        simulation_running.wait()
+        with simulation_lock:
+            redraw_board = step()
+            profiler = instrumentation.profiler
+            if profiler is not None:
+                profiler.end_tick()
+            turns += 1
+            # the colors are only collected when the user interface can show them
+            now = perf_counter()
+            if now >= next_frame:
+                hand_over_frame(redraw_board, turns)
+                turns = 0
+                next_frame = now + 1 / frames_per_second
+
+
+def hand_over_frame(redraw_board, turns=0):
+    """
+    :param turns: The number of turns played since the previous frame was handed over.
+    """
+    global frame_redraw_board, turns_played
+    # while the board is not redrawn, the changed cells are kept until it is
+    colors = renderer.collect_changes() if redraw_board else {}
+    with frame_lock:
+        frame_colors.update(colors)
+        frame_redraw_board = redraw_board
+        turns_played += turns
+
+
+def frame_loop():
+    """ Draws the latest frame of the simulation thread in turbo mode, runs on the thread of the user interface """
+    global frame_colors, turns_played
+    with frame_lock:
+        colors = frame_colors
+        frame_colors = {}
+        redraw_board = frame_redraw_board
+        turns = turns_played
+        turns_played = 0
+    draw(redraw_board, colors)
+    root.title("Snake ({} turns per second)".format(int(turns * frames_per_second)))
+    canvas.after(int(1000 / frames_per_second), frame_loop)
 
 
 def on_slider_update(event):
     global scale, tics_per_second
     tics_per_second = scale.get()
+    if turbo_mode:
+        if tics_per_second > 0:
+            simulation_running.set()
+        else:
+            simulation_running.clear()
+    else:
+        schedule_game_loop()
 
 
 if __name__ == "__main__":
@@ -22,7 +22,7 @@ class Direction(Enum):
 
         :return: The new direction after making this move.
         """
-        return Direction((self.value + move.value) % 4)
+        return new_directions[self.value][move.value + 1]
 
     def get_xy_manipulation(self):
         """
@@ -37,29 +37,52 @@ class Direction(Enum):
         :return: A tuple with the x and y manipulation when going straight given the direction. The x value is the
         first element and the y value the second element.
         """
-        m = {
-            Direction.NORTH: (0, -1),
-            Direction.EAST: (1, 0),
-            Direction.SOUTH: (0, 1),
-            Direction.WEST: (-1, 0)
-        }
-        return m[self]
+        return xy_manipulations[self.value]
 
     def get_xy_moves(self):
         """
         Used to retrieve all possible moves given the direction. For instance, when facing North, the available moves
         are going North, going East or going West.
 
-        :return: A list containing all available x y manipulations given the direction.
+        :return: A tuple containing all available x y manipulations given the direction.
         """
-        m = {
-            Direction.NORTH: [Direction.NORTH.get_xy_manipulation(), Direction.EAST.get_xy_manipulation(),
-                              Direction.WEST.get_xy_manipulation()],
-            Direction.EAST: [Direction.NORTH.get_xy_manipulation(), Direction.EAST.get_xy_manipulation(),
-                             Direction.SOUTH.get_xy_manipulation()],
-            Direction.SOUTH: [Direction.SOUTH.get_xy_manipulation(), Direction.EAST.get_xy_manipulation(),
-                              Direction.WEST.get_xy_manipulation()],
-            Direction.WEST: [Direction.NORTH.get_xy_manipulation(), Direction.WEST.get_xy_manipulation(),
-                             Direction.SOUTH.get_xy_manipulation()],
-        }
-        return m[self]
+        return xy_moves[self.value]
+
+
+# The tables below are indexed by the value of a direction and the value of a move plus one, so the game can look up
+# the result of a move without creating any objects.
+
+# x and y manipulation when going straight, per direction
+xy_manipulations = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+# new direction per direction and move
+new_directions = tuple(tuple(Direction((direction + move) % 4) for move in (-1, 0, 1)) for direction in range(4))
+
+# x and y manipulation and the new direction per direction and move
+transitions = tuple(tuple(xy_manipulations[new_direction.value] + (new_direction,)
+                          for new_direction in new_directions[direction]) for direction in range(4))
+
+# available x y manipulations per direction, see Direction.get_xy_moves()
+xy_moves = (
+    (xy_manipulations[0], xy_manipulations[1], xy_manipulations[3]),
+    (xy_manipulations[0], xy_manipulations[1], xy_manipulations[2]),
+    (xy_manipulations[2], xy_manipulations[1], xy_manipulations[3]),
+    (xy_manipulations[0], xy_manipulations[3], xy_manipulations[2])
+)
+
+# move answering a step backwards per direction, a step backwards can not be made so the snake turns instead
+reverse_moves = (Move.RIGHT, Move.RIGHT, Move.RIGHT, Move.LEFT)
+
+
+def build_moves_by_step(direction):
+    """
+    :return: A dict with the move that takes a step of the given x and y manipulation when facing the given direction.
+    """
+    moves = {(-xy_manipulations[direction][0], -xy_manipulations[direction][1]): reverse_moves[direction]}
+    for (x, y, new_direction), move in zip(transitions[direction], (Move.LEFT, Move.STRAIGHT, Move.RIGHT)):
+        moves[(x, y)] = move
+    return moves
+
+
+# move per direction and x and y manipulation of the step
+moves_by_step = tuple(build_moves_by_step(direction) for direction in range(4))
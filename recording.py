@@ -0,0 +1,315 @@
+import struct
+import zlib
+
+from gameobjects import GameObject
+from move import Direction, Move, transitions
+
+magic = b"SNKREC"
+version = 2
+header_format = "<6sBIIq??IIBIII"
+
+# every turn is stored in two bits: the move made or no_move when the snake died without moving (starvation or an
+# invalid return value of get_move)
+move_codes = {Move.LEFT: 0, Move.STRAIGHT: 1, Move.RIGHT: 2}
+moves_by_code = {code: move for move, code in move_codes.items()}
+no_move = 3
+
+
+def write_varint(buffer, value):
+    while value >= 0x80:
+        buffer.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_varint(data, offset):
+    """
+    :return: A tuple with the decoded value and the offset of the next byte.
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class RecordingAgent:
+    """
+    Wraps the agent of a recorded snake and remembers the last move it made. All other attributes are taken from the
+    wrapped agent.
+    """
+
+    def __init__(self, wrapped):
+        self.wrapped = wrapped
+        self.last_move = None
+
+    def get_move(self, *args):
+        self.last_move = self.wrapped.get_move(*args)
+        return self.last_move
+
+    def __getattr__(self, name):
+        return getattr(self.wrapped, name)
+
+
+class Recorder:
+    """
+    Records a game played by a GameEngine. The recording holds the initial board and snake, the moves of the snake
+    packed in two bits per turn, the positions where food spawned and the positions where the snake was reborn.
+    Everything else is deterministic, so this is enough to rebuild every turn with a Replayer. Recording can start at
+    any turn, the snake does not have to be new.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        board = engine.board
+        snake = engine.snake
+        self.width = board.width
+        self.height = board.height
+        self.seed = engine.seed
+        self.should_grow = snake.agent.should_grow_on_food_collision()
+        self.walls = [(x, y) for x in range(board.width) for y in range(board.height) if board.is_wall_at(x, y)]
+        self.food = set((x, y) for x in range(board.width) for y in range(board.height) if board.is_food_at(x, y))
+        self.initial_food = sorted(self.food)
+        self.head = (snake.x, snake.y)
+        self.direction = snake.direction
+        self.body_parts = list(snake.body_parts)
+        self.size = snake.size
+        self.score = snake.score
+        self.tics_alive = snake.tics_alive
+
+        self.ticks = 0
+        self.moves = bytearray()
+        self.food_events = []  # (tick, x, y) for every food block that spawned
+        self.respawn_events = []  # (tick, x, y) for every time the snake was reborn
+
+        self.agent = RecordingAgent(snake.agent)
+        snake.agent = self.agent
+        self.changed_cells = board.track_changes()
+        engine.tick_listeners.append(self.on_tick)
+
+    def on_tick(self, result):
+        move = self.agent.last_move
+        self.agent.last_move = None
+        # a starved snake dies before the agent is asked for a move, so last_move stays None
+        code = move_codes.get(move, no_move) if isinstance(move, Move) else no_move
+        if self.ticks % 4 == 0:
+            self.moves.append(0)
+        self.moves[-1] |= code << (2 * (self.ticks % 4))
+
+        board = self.engine.board
+        for x, y in self.changed_cells:
+            if board.is_food_at(x, y):
+                if (x, y) not in self.food:
+                    self.food.add((x, y))
+                    self.food_events.append((self.ticks, x, y))
+            else:
+                self.food.discard((x, y))
+        self.changed_cells.clear()
+
+        if result is not None:
+            self.respawn_events.append((self.ticks, self.engine.snake.x, self.engine.snake.y))
+        self.ticks += 1
+
+    def close(self):
+        """ Stops recording, the snake gets its own agent back """
+        self.engine.snake.agent = self.agent.wrapped
+        self.engine.board.untrack_changes(self.changed_cells)
+        self.engine.tick_listeners.remove(self.on_tick)
+
+    def to_bytes(self):
+        payload = bytearray()
+        write_varint(payload, len(self.walls))
+        for x, y in self.walls:
+            write_varint(payload, x * self.height + y)
+        write_varint(payload, len(self.initial_food))
+        for x, y in self.initial_food:
+            write_varint(payload, x * self.height + y)
+        write_varint(payload, len(self.body_parts))
+        for x, y in self.body_parts:
+            write_varint(payload, x * self.height + y)
+        write_varint(payload, self.ticks)
+        payload += self.moves
+        # the ticks of the events are stored as the difference with the previous event
+        for events in (self.food_events, self.respawn_events):
+            write_varint(payload, len(events))
+            previous = 0
+            for tick, x, y in events:
+                write_varint(payload, tick - previous)
+                write_varint(payload, x * self.height + y)
+                previous = tick
+        header = struct.pack(header_format, magic, version, self.width, self.height,
+                             -1 if self.seed is None else self.seed, self.seed is not None, self.should_grow,
+                             self.head[0], self.head[1], self.direction.value, self.size, self.score, self.tics_alive)
+        return header + zlib.compress(bytes(payload), 9)
+
+    def save(self, path):
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+
+class ReplayState:
+    """
+    The state of a recorded game right before a given turn.
+    """
+
+    def __init__(self, tick, head, direction, body_parts, size, score, tics_alive, food):
+        self.tick = tick
+        self.head = head
+        self.direction = direction
+        self.body_parts = body_parts
+        self.size = size
+        self.score = score
+        self.tics_alive = tics_alive
+        self.food = food
+
+    def copy(self):
+        return ReplayState(self.tick, self.head, self.direction, list(self.body_parts), self.size, self.score,
+                           self.tics_alive, set(self.food))
+
+
+class Replayer:
+    """
+    Rebuilds the turns of a recording. While replaying, a copy of the state is kept every keyframe_interval turns, so
+    a turn before an already visited turn is rebuilt from the nearest keyframe instead of from the start.
+    """
+
+    keyframe_interval = 4096
+
+    def __init__(self, data):
+        """
+        :param data: The bytes of a recording, see Recorder.to_bytes().
+        """
+        header_size = struct.calcsize(header_format)
+        (file_magic, file_version, self.width, self.height, seed, has_seed, self.should_grow, head_x, head_y,
+         direction, size, score, tics_alive) = struct.unpack(header_format, data[:header_size])
+        if file_magic != magic or file_version != version:
+            raise RuntimeError("Not a recording or recorded with an unsupported version")
+        self.seed = seed if has_seed else None
+        payload = zlib.decompress(data[header_size:])
+
+        offset = 0
+        count, offset = read_varint(payload, offset)
+        self.walls = set()
+        for i in range(count):
+            position, offset = read_varint(payload, offset)
+            self.walls.add(divmod(position, self.height))
+        count, offset = read_varint(payload, offset)
+        food = set()
+        for i in range(count):
+            position, offset = read_varint(payload, offset)
+            food.add(divmod(position, self.height))
+        count, offset = read_varint(payload, offset)
+        body_parts = []
+        for i in range(count):
+            position, offset = read_varint(payload, offset)
+            body_parts.append(divmod(position, self.height))
+        self.ticks, offset = read_varint(payload, offset)
+        move_bytes = (self.ticks + 3) // 4
+        self.moves = payload[offset:offset + move_bytes]
+        offset += move_bytes
+
+        event_lists = []
+        for i in range(2):
+            events = {}
+            count, offset = read_varint(payload, offset)
+            tick = 0
+            for j in range(count):
+                delta, offset = read_varint(payload, offset)
+                position, offset = read_varint(payload, offset)
+                tick += delta
+                events[tick] = divmod(position, self.height)
+            event_lists.append(events)
+        self.food_events, self.respawn_events = event_lists
+
+        self.keyframes = [ReplayState(0, (head_x, head_y), Direction(direction), body_parts, size, score, tics_alive,
+                                      food)]
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            return cls(file.read())
+
+    def get_death_ticks(self):
+        """
+        :return: A sorted list of the turns during which the snake died.
+        """
+        return sorted(self.respawn_events)
+
+    def get_move(self, tick):
+        """
+        :return: The move made during the given turn, None if the snake died without moving.
+        """
+        code = (self.moves[tick // 4] >> (2 * (tick % 4))) & 3
+        return moves_by_code.get(code)
+
+    def state_at(self, tick):
+        """
+        :param tick: The turn to rebuild, between 0 and the number of recorded turns.
+
+        :return: The ReplayState right before the given turn is played.
+        """
+        if not 0 <= tick <= self.ticks:
+            raise IndexError("tick out of range")
+        keyframe = min(tick // self.keyframe_interval, len(self.keyframes) - 1)
+        state = self.keyframes[keyframe].copy()
+        while state.tick < tick:
+            self.apply_tick(state)
+            if state.tick % self.keyframe_interval == 0 and state.tick // self.keyframe_interval == len(self.keyframes):
+                self.keyframes.append(state.copy())
+        return state
+
+    def apply_tick(self, state):
+        """
+        Plays a single turn on the given state, following the rules of Snake.update.
+        """
+        tick = state.tick
+        move = self.get_move(tick)
+        died = move is None
+        if not died:
+            state.body_parts = [state.head] + state.body_parts
+            while len(state.body_parts) > state.size:
+                del state.body_parts[-1]
+            dx, dy, state.direction = transitions[state.direction.value][move.value + 1]
+            x = state.head[0] + dx
+            y = state.head[1] + dy
+            state.head = (x, y)
+            died = (not (0 <= x < self.width and 0 <= y < self.height) or (x, y) in self.walls or
+                    (x, y) in state.body_parts)
+            if not died:
+                if (x, y) in state.food:
+                    if self.should_grow:
+                        state.size += 1
+                    state.score += 1
+                    state.food.discard((x, y))
+                state.tics_alive += 1
+
+        if tick in self.food_events:
+            state.food.add(self.food_events[tick])
+        if died:
+            state.head = self.respawn_events[tick]
+            state.direction = Direction.NORTH
+            state.body_parts = []
+            state.size = 0
+            state.score = 0
+            state.tics_alive = 0
+        state.tick += 1
+
+    def get_board(self, state):
+        """
+        :return: A two dimensional array of game objects of the given state, in the format of Board.get_copy().
+        """
+        board = [[GameObject.EMPTY for y in range(self.height)] for x in range(self.width)]
+        for x, y in self.walls:
+            board[x][y] = GameObject.WALL
+        for x, y in state.food:
+            board[x][y] = GameObject.FOOD
+        for x, y in state.body_parts:
+            board[x][y] = GameObject.SNAKE_BODY
+        x, y = state.head
+        if 0 <= x < self.width and 0 <= y < self.height:
+            board[x][y] = GameObject.SNAKE_HEAD
+        return board
@@ -0,0 +1,67 @@
+import importlib
+import importlib.util
+import os
+
+# the agents that can be chosen by name: name -> (module, class, keyword arguments of the constructor). The modules are
+# only imported when the agent is created.
+agents = {
+    "astar": ("agent", "Agent", {}),
+    "astar-list": ("agent", "Agent", {"planner": "list"}),
+    "astar-ida": ("agent", "Agent", {"planner": "ida"}),
+    "hamiltonian": ("hamiltonian", "HamiltonianAgent", {}),
+    "old": ("agentOLD", "Agent", {}),
+    "old2": ("agentOLD2", "Agent", {})
+}
+
+# the agent of a snake that is not given an agent
+default_agent = "astar"
+
+
+def register(name, module, class_name, **kwargs):
+    """
+    Adds an agent to the registry.
+
+    :param name: The name the agent is chosen by.
+
+    :param module: The name of the module containing the agent class.
+
+    :param class_name: The name of the agent class.
+
+    :param kwargs: The keyword arguments passed to the constructor of the agent.
+    """
+    agents[name] = (module, class_name, kwargs)
+
+
+def load_class(module, class_name):
+    """
+    :param module: The name of a module, or the path of a Python file.
+
+    :return: The class with the given name from the module.
+    """
+    if module.endswith(".py"):
+        name = os.path.splitext(os.path.basename(module))[0]
+        spec = importlib.util.spec_from_file_location(name, module)
+        loaded = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(loaded)
+    else:
+        loaded = importlib.import_module(module)
+    return getattr(loaded, class_name)
+
+
+def create_agent(name=None):
+    """
+    Creates an agent chosen by name.
+
+    :param name: The name of a registered agent, "module:Class" or "path/to/file.py:Class". None for the default agent.
+
+    :return: A new agent.
+    """
+    if name is None:
+        name = default_agent
+    if name in agents:
+        module, class_name, kwargs = agents[name]
+        return load_class(module, class_name)(**kwargs)
+    if ":" not in name:
+        raise ValueError("Unknown agent '{}', choose one of {} or use module:Class".format(name, sorted(agents)))
+    module, class_name = name.rsplit(":", 1)
+    return load_class(module, class_name)()
@@ -0,0 +1,419 @@
+import asyncio
+import os
+import struct
+import sys
+
+from board import BoardView
+from engine import GameResult
+from gameobjects import GameObject
+from move import Direction, Move
+from recording import read_varint, write_varint
+from registry import create_agent
+
+# Every message is a frame: a header with the message type and the length of the payload, followed by the payload.
+# Numbers in the payload are varints, game objects are single bytes holding GameObject.value and cells are stored as
+# x * height + y.
+frame_header = struct.Struct("<BI")
+move_request = 1
+move_reply = 2
+die_notice = 3
+close_notice = 4
+
+# board sections: the complete board or only the cells that changed since the previous message
+board_full = 0
+board_delta = 1
+# body sections: the complete body or only its new length, see encode_body()
+body_full = 0
+body_length = 1
+
+move_codes = {Move.LEFT: 0, Move.STRAIGHT: 1, Move.RIGHT: 2}
+moves_by_code = {code: move for move, code in move_codes.items()}
+no_move = 3
+
+
+def write_frame(buffer, message_type, payload):
+    buffer += frame_header.pack(message_type, len(payload))
+    buffer += payload
+
+
+class RemoteAgent:
+    """
+    Agent that runs another agent in a child process and talks to it over the pipes of the process with asyncio. The
+    child keeps its own copy of the board, so after the first move only the changed cells are sent. The body of the
+    snake is sent as its new length whenever it follows from the previous message.
+
+    The agent can be used like any other agent, get_move() then waits for the answer. With send_request() and
+    receive_move() the engine can do other work while the child is thinking, see play_pipelined().
+    """
+
+    def __init__(self, agent_spec="astar", timeout=1.0, default_move=Move.STRAIGHT):
+        """
+        :param agent_spec: The agent to run in the child process, a name or "module:Class" as accepted by
+        registry.create_agent().
+
+        :param timeout: The number of seconds to wait for a move, None to wait forever. When the child does not answer
+        in time, the default move is made and its answer is dropped when it comes in later.
+
+        :param default_move: The move made when the child does not answer in time.
+        """
+        self.agent_spec = agent_spec
+        self.timeout = timeout
+        self.default_move = default_move
+        self.loop = asyncio.new_event_loop()
+        self.process = None
+        self.reader_task = None
+        # futures of the requests which are waiting for an answer, by request id
+        self.pending = {}
+        self.next_request_id = 0
+        self.should_grow = True
+        self.timeouts = 0
+
+        # the state the child knows about, used to send only what changed
+        self.board = None
+        self.changed_cells = None
+        self.sent_grid = None
+        self.sent_head = None
+        self.sent_body = None
+        self.loop.run_until_complete(self.start())
+
+    async def start(self):
+        script = os.path.abspath(__file__)
+        self.process = await asyncio.create_subprocess_exec(sys.executable, script, self.agent_spec,
+                                                            stdin=asyncio.subprocess.PIPE,
+                                                            stdout=asyncio.subprocess.PIPE)
+        self.reader_task = self.loop.create_task(self.read_replies())
+
+    async def read_replies(self):
+        """ Reads the answers of the child and hands them to the waiting requests, late answers are dropped """
+        stdout = self.process.stdout
+        while True:
+            try:
+                message_type, length = frame_header.unpack(await stdout.readexactly(frame_header.size))
+                payload = await stdout.readexactly(length)
+            except asyncio.IncompleteReadError:
+                break
+            if message_type != move_reply:
+                continue
+            request_id, offset = read_varint(payload, 0)
+            move = moves_by_code.get(payload[offset])
+            should_grow = payload[offset + 1] == 1
+            future = self.pending.pop(request_id, None)
+            if future is not None and not future.done():
+                future.set_result((move, should_grow))
+        # the child stopped, nothing will be answered anymore
+        for future in self.pending.values():
+            if not future.done():
+                future.set_result((None, True))
+        self.pending.clear()
+
+    def encode_board(self, payload, board):
+        """
+        Adds the board section to the payload. When the board is a view on a live board, the changed cells are taken
+        from the board, otherwise the board is compared with the previously sent board.
+        """
+        if board is None:
+            # nothing is known about changes
+            payload.append(board_delta)
+            write_varint(payload, 0)
+            return
+        if self.sent_grid is None:
+            if isinstance(board, BoardView):
+                self.board = board.board
+                self.changed_cells = self.board.track_changes()
+            width, height = len(board), len(board[0])
+            self.sent_grid = [[board[x][y] for y in range(height)] for x in range(width)]
+            payload.append(board_full)
+            write_varint(payload, width)
+            write_varint(payload, height)
+            payload += bytes(game_object.value for column in self.sent_grid for game_object in column)
+            return
+
+        height = len(self.sent_grid[0])
+        changes = []
+        if self.changed_cells is not None:
+            for x, y in self.changed_cells:
+                game_object = board[x][y]
+                if self.sent_grid[x][y] != game_object:
+                    changes.append((x, y, game_object))
+            self.changed_cells.clear()
+        else:
+            for x, column in enumerate(self.sent_grid):
+                board_column = board[x]
+                for y in range(height):
+                    if column[y] != board_column[y]:
+                        changes.append((x, y, board_column[y]))
+        payload.append(board_delta)
+        write_varint(payload, len(changes))
+        for x, y, game_object in changes:
+            self.sent_grid[x][y] = game_object
+            write_varint(payload, x * height + y)
+            payload.append(game_object.value)
+
+    def encode_body(self, payload, head_position, body_parts):
+        """
+        Adds the body section to the payload. After a move the body is the previous head followed by the previous
+        body, cut to the new length, so only the length is sent. Otherwise the complete body is sent.
+        """
+        height = len(self.sent_grid[0])
+        if self.sent_body is not None and ([self.sent_head] + self.sent_body)[:len(body_parts)] == body_parts:
+            payload.append(body_length)
+            write_varint(payload, len(body_parts))
+        else:
+            payload.append(body_full)
+            write_varint(payload, len(body_parts))
+            for x, y in body_parts:
+                write_varint(payload, x * height + y)
+        self.sent_head = head_position
+        self.sent_body = list(body_parts)
+
+    def send_request(self, board, score, turns_alive, turns_to_starve, direction, head_position, body_parts):
+        """
+        Sends the state of a turn to the child, which starts thinking about its move right away. The arguments are
+        those of get_move.
+
+        :return: The id of the request, to be given to receive_move().
+        """
+        request_id = self.next_request_id
+        self.next_request_id += 1
+        payload = bytearray()
+        write_varint(payload, request_id)
+        write_varint(payload, score)
+        write_varint(payload, turns_alive)
+        # -1 when starvation is disabled
+        write_varint(payload, turns_to_starve + 1)
+        payload.append(direction.value)
+        self.encode_board(payload, board)
+        height = len(self.sent_grid[0])
+        write_varint(payload, head_position[0] * height + head_position[1])
+        self.encode_body(payload, head_position, body_parts)
+
+        frame = bytearray()
+        write_frame(frame, move_request, payload)
+        self.pending[request_id] = self.loop.create_future()
+        self.process.stdin.write(frame)
+        return request_id
+
+    async def receive_move(self, request_id):
+        """
+        :return: The move the child made for the given request, the default move when it did not answer in time.
+        """
+        future = self.pending.get(request_id)
+        if future is None:
+            return self.default_move
+        try:
+            move, should_grow = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.pending.pop(request_id, None)
+            self.timeouts += 1
+            return self.default_move
+        self.should_grow = should_grow
+        return move
+
+    async def request_move(self, *args):
+        return await self.receive_move(self.send_request(*args))
+
+    def get_move(self, board, score, turns_alive, turns_to_starve, direction, head_position, body_parts):
+        return self.loop.run_until_complete(self.request_move(board, score, turns_alive, turns_to_starve, direction,
+                                                              head_position, body_parts))
+
+    def should_redraw_board(self):
+        return True
+
+    def should_copy_board(self):
+        # the cells that changed are taken from the live board
+        return False
+
+    def should_grow_on_food_collision(self):
+        # the answer the child gave together with its last move
+        return self.should_grow
+
+    def on_die(self, head_position, board, score, body_parts):
+        # the child builds the board without snake from its own copy, brought up to date with the changed cells of
+        # the live board
+        if self.sent_grid is None:
+            return
+        height = len(self.sent_grid[0])
+        payload = bytearray()
+        self.encode_board(payload, self.board.get_view() if self.board is not None else None)
+        # the head may have left the board, so both coordinates are stored plus one
+        write_varint(payload, head_position[0] + 1)
+        write_varint(payload, head_position[1] + 1)
+        write_varint(payload, score)
+        write_varint(payload, len(body_parts))
+        for x, y in body_parts:
+            write_varint(payload, x * height + y)
+        frame = bytearray()
+        write_frame(frame, die_notice, payload)
+        self.process.stdin.write(frame)
+
+    def close(self):
+        """ Stops the child process """
+        if self.board is not None:
+            self.board.untrack_changes(self.changed_cells)
+            self.board = None
+        frame = bytearray()
+        write_frame(frame, close_notice, b"")
+        try:
+            self.process.stdin.write(frame)
+            self.loop.run_until_complete(self.process.stdin.drain())
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        self.loop.run_until_complete(self.process.wait())
+        self.loop.run_until_complete(self.reader_task)
+        self.loop.close()
+
+
+async def play_pipelined(engine, n_ticks):
+    """
+    Plays a given number of turns like GameEngine.run(), for an engine whose snake is controlled by a RemoteAgent.
+    While the child thinks about its move, the engine handles the previous turn: the tick listeners are called and
+    the result is stored. The listeners therefore run one turn late, before anything else changes on the board.
+
+    :return: A list of GameResults of all games that ended during these turns.
+    """
+    snake = engine.snake
+    board = engine.board
+    remote = snake.agent
+    finished = []
+    # results of the previous turn whose listeners still have to be called
+    unreported = []
+    for i in range(n_ticks):
+        engine.tics += 1
+        died = False
+        if snake.tics_to_starve == 0:
+            snake.cause_of_death = "starved"
+            died = True
+        else:
+            request_id = remote.send_request(board.get_view(), snake.score, snake.tics_alive, snake.tics_to_starve,
+                                             snake.direction, (snake.x, snake.y), snake.body_parts)
+            for result in unreported:
+                for listener in engine.tick_listeners:
+                    listener(result)
+            unreported = []
+            move = await remote.receive_move(request_id)
+            if not isinstance(move, Move):
+                snake.cause_of_death = "invalid_move"
+                died = True
+            else:
+                snake.move_body(board, move)
+                cause = snake.get_cause_of_death(board)
+                if cause is not None:
+                    snake.cause_of_death = cause
+                    died = True
+                else:
+                    snake.end_turn(board)
+
+        result = None
+        if died:
+            result = GameResult(snake.score, snake.tics_alive, snake.cause_of_death)
+            engine.results.append(result)
+            finished.append(result)
+            snake.reset(board, engine.print_score, True)
+        unreported.append(result)
+    for result in unreported:
+        for listener in engine.tick_listeners:
+            listener(result)
+    return finished
+
+
+def run_pipelined(engine, n_ticks):
+    """ Runs play_pipelined() on the event loop of the RemoteAgent of the engine """
+    return engine.snake.agent.loop.run_until_complete(play_pipelined(engine, n_ticks))
+
+
+def serve(agent, input_stream, output_stream):
+    """
+    Answers the requests of a RemoteAgent with the moves of the given agent, until the stream is closed.
+    """
+    grid = None
+    height = 0
+    head = None
+    body = []
+
+    def decode_board(payload, offset):
+        nonlocal grid, height
+        section = payload[offset]
+        offset += 1
+        if section == board_full:
+            width, offset = read_varint(payload, offset)
+            height, offset = read_varint(payload, offset)
+            grid = [[GameObject(payload[offset + x * height + y]) for y in range(height)] for x in range(width)]
+            return offset + width * height
+        count, offset = read_varint(payload, offset)
+        for j in range(count):
+            position, offset = read_varint(payload, offset)
+            x, y = divmod(position, height)
+            grid[x][y] = GameObject(payload[offset])
+            offset += 1
+        return offset
+
+    while True:
+        header = input_stream.read(frame_header.size)
+        if len(header) < frame_header.size:
+            return
+        message_type, length = frame_header.unpack(header)
+        payload = input_stream.read(length)
+        if message_type == close_notice:
+            return
+
+        if message_type == die_notice:
+            offset = decode_board(payload, 0)
+            x, offset = read_varint(payload, offset)
+            y, offset = read_varint(payload, offset)
+            score, offset = read_varint(payload, offset)
+            count, offset = read_varint(payload, offset)
+            body_parts = []
+            for j in range(count):
+                position, offset = read_varint(payload, offset)
+                body_parts.append(divmod(position, height))
+            board = [[GameObject.EMPTY if game_object in (GameObject.SNAKE_HEAD, GameObject.SNAKE_BODY)
+                      else game_object for game_object in column] for column in grid]
+            agent.on_die((x - 1, y - 1), board, score, body_parts)
+            continue
+
+        request_id, offset = read_varint(payload, 0)
+        score, offset = read_varint(payload, offset)
+        turns_alive, offset = read_varint(payload, offset)
+        turns_to_starve, offset = read_varint(payload, offset)
+        direction = Direction(payload[offset])
+        offset = decode_board(payload, offset + 1)
+        position, offset = read_varint(payload, offset)
+        new_head = divmod(position, height)
+        section = payload[offset]
+        offset += 1
+        count, offset = read_varint(payload, offset)
+        if section == body_length:
+            body = ([head] + body)[:count]
+        else:
+            body = []
+            for j in range(count):
+                position, offset = read_varint(payload, offset)
+                body.append(divmod(position, height))
+        head = new_head
+
+        try:
+            move = agent.get_move(grid, score, turns_alive, turns_to_starve - 1, direction, head, list(body))
+            should_grow = agent.should_grow_on_food_collision()
+        except Exception as exception:
+            print("Agent failed: {}".format(exception), file=sys.stderr)
+            move, should_grow = None, True
+        reply = bytearray()
+        write_varint(reply, request_id)
+        reply.append(move_codes.get(move, no_move) if isinstance(move, Move) else no_move)
+        reply.append(1 if should_grow else 0)
+        frame = bytearray()
+        write_frame(frame, move_reply, reply)
+        output_stream.write(frame)
+        output_stream.flush()
+
+
+def main():
+    agent = create_agent(sys.argv[1] if len(sys.argv) > 1 else None)
+    output_stream = sys.stdout.buffer
+    # the pipe to the engine only carries frames, anything the agent prints goes to the error stream
+    sys.stdout = sys.stderr
+    serve(agent, sys.stdin.buffer, output_stream)
+
+
+if __name__ == "__main__":
+    main()
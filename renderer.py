@@ -0,0 +1,65 @@
+class BoardRenderer:
+    """
+    Draws a board on a tkinter canvas. The rectangle of every cell is created once, after that only the cells that
+    changed since the previous frame are recolored.
+    """
+
+    tag = "cell"
+
+    def __init__(self, board, canvas):
+        self.board = board
+        self.canvas = canvas
+        self.items = []
+        self.colors = []
+        for x in range(board.width):
+            column_items = []
+            column_colors = []
+            for y in range(board.height):
+                draw_x = x * board.block_width
+                draw_y = y * board.block_height
+                color = board.get_game_object_at(x, y).getColor()
+                column_items.append(canvas.create_rectangle(draw_x, draw_y, draw_x + board.block_width,
+                                                            draw_y + board.block_height, fill=color, outline="",
+                                                            tags=self.tag))
+                column_colors.append(color)
+            self.items.append(column_items)
+            self.colors.append(column_colors)
+        self.changed_cells = board.track_changes()
+
+    def draw(self):
+        self.apply_changes(self.collect_changes())
+
+    def collect_changes(self):
+        """
+        Takes the colors of the cells that changed since the previous call. Does not touch the canvas, so it can be
+        called from the thread that updates the board.
+
+        :return: A dict with the new color of every changed cell, by (x, y).
+        """
+        colors = {}
+        for x, y in self.changed_cells:
+            colors[(x, y)] = self.board.get_game_object_at(x, y).getColor()
+        self.changed_cells.clear()
+        return colors
+
+    def apply_changes(self, colors):
+        """
+        Recolors the cells, needs to be called from the thread of the user interface.
+
+        :param colors: A dict with the color of cells by (x, y), see collect_changes().
+        """
+        for (x, y), color in colors.items():
+            if color != self.colors[x][y]:
+                self.canvas.itemconfig(self.items[x][y], fill=color)
+                self.colors[x][y] = color
+
+    def show(self):
+        self.canvas.itemconfig(self.tag, state="normal")
+
+    def hide(self):
+        self.canvas.itemconfig(self.tag, state="hidden")
+
+    def close(self):
+        """ Removes the rectangles from the canvas and stops tracking the board """
+        self.board.untrack_changes(self.changed_cells)
+        self.canvas.delete(self.tag)
@@ -1,24 +1,29 @@
 from random import randint
+from time import perf_counter
 
-from agent import Agent
-from gameobjects import GameObject
-from move import Direction, Move
+import instrumentation
+import registry
+from move import Direction, Move, transitions
 
 
 class Snake:
-    def __init__(self, board_width, board_height, max_tics_to_starve):
+    def __init__(self, board_width, board_height, max_tics_to_starve, agent=None):
         self.board_width = board_width
         self.board_height = board_height
         self.x = randint(0, board_width - 1)
         self.y = randint(0, board_height - 1)
         self.direction = Direction.NORTH
         self.body_parts = []
+        # set of all cells occupied by the body, kept in sync with body_parts for constant time lookups
+        self.body_cells = set()
         self.score = 0
         self.tics_alive = 0
         self.tics_to_starve = max_tics_to_starve
         self.max_tics_to_starve = max_tics_to_starve
-        self.agent = Agent()
+        # the agent controlling the snake, by default the default agent of the registry
+        self.agent = agent if agent is not None else registry.create_agent()
         self.size = 0
+        self.cause_of_death = None
 
     def update(self, board):
         redraw_board = self.agent.should_redraw_board()
@@ -28,32 +33,79 @@ class Snake:
 
         # check starvation (if enabled)
         if self.tics_to_starve != -1 and self.tics_to_starve == 0:
+            self.cause_of_death = "starved"
             return True, redraw_board
 
+        # agents written before boards could be shared do not have should_copy_board() and get a copy
+        copy_board = self.agent.should_copy_board() if hasattr(self.agent, "should_copy_board") else True
+        if not isinstance(copy_board, bool):
+            raise RuntimeError("should_copy_board() must return a boolean value")
+
+        profiler = instrumentation.profiler
+        if profiler is not None:
+            start = perf_counter()
+        agent_board = board.get_copy() if copy_board else board.get_view()
+        if profiler is not None:
+            start = profiler.record("get_copy", start)
+
         # retrieve move from the agent
-        move = self.agent.get_move(board.get_copy(), self.score, self.tics_alive, self.tics_to_starve,
-                                   self.direction, (self.x, self.y), self.body_parts)
+        move = self.agent.get_move(agent_board, self.score, self.tics_alive, self.tics_to_starve, self.direction,
+                                   (self.x, self.y), self.body_parts)
+        if profiler is not None:
+            start = profiler.record("get_move", start)
 
         # check return value of get_move
-        if not (move == Move.RIGHT or move == Move.LEFT or move == Move.STRAIGHT):
+        if not isinstance(move, Move):
+            self.cause_of_death = "invalid_move"
             return True, redraw_board
 
-        # adjust body parts
-        self.body_parts = [(self.x, self.y)] + self.body_parts
-        while len(self.body_parts) > self.size:
-            del self.body_parts[-1]
-
-        self.direction = self.direction.get_new_direction(move)
-        manipulation = self.direction.get_xy_manipulation()
-        self.x += manipulation[0]
-        self.y += manipulation[1]
+        self.move_body(board, move)
+        if profiler is not None:
+            start = profiler.record("move_body", start)
 
         # check if died
-        if self.died(board):
+        cause = self.get_cause_of_death(board)
+        if profiler is not None:
+            start = profiler.record("died", start)
+        if cause is not None:
+            self.cause_of_death = cause
             return True, redraw_board
 
-        # check on collision with food
-        if board.board[self.x][self.y] == GameObject.FOOD:
+        if self.end_turn(board) and profiler is not None:
+            profiler.record("eat_food", start)
+
+        return False, redraw_board
+
+    def move_body(self, board, move):
+        """
+        Moves the head one cell in the direction given by the move, the body follows. The cells the snake left and
+        entered are updated on the board.
+
+        :param move: A valid Move.
+        """
+        changed_cells = [(self.x, self.y)]
+        self.body_parts = [(self.x, self.y)] + self.body_parts
+        self.body_cells.add((self.x, self.y))
+        while len(self.body_parts) > self.size:
+            tail = self.body_parts.pop()
+            self.body_cells.discard(tail)
+            changed_cells.append(tail)
+
+        dx, dy, self.direction = transitions[self.direction.value][move.value + 1]
+        self.x += dx
+        self.y += dy
+        changed_cells.append((self.x, self.y))
+        for x, y in changed_cells:
+            board.update_cell(x, y)
+
+    def end_turn(self, board):
+        """
+        Finishes the turn of a snake that survived its move: the food at the head is eaten and the turn is counted.
+
+        :return: True if the snake ate food.
+        """
+        ate = board.is_food_at(self.x, self.y)
+        if ate:
             should_grow = self.agent.should_grow_on_food_collision()
             if not isinstance(should_grow, bool):
                 raise RuntimeError("should_grow_on_food_collision() must return a boolean value")
@@ -67,34 +119,46 @@ class Snake:
         self.tics_alive += 1
         if self.max_tics_to_starve != -1:
             self.tics_to_starve -= 1
-
-        return False, redraw_board
+        return ate
 
     def reset(self, board, redraw_board, print_score_not_on_non_redraw):
         if redraw_board or (not redraw_board and not print_score_not_on_non_redraw):
             print("Score achieved: {}. Turns it took: {}".format(self.score, self.tics_alive))
         self.agent.on_die((self.x, self.y), board.get_copy_without_snake(), self.score, self.body_parts)
+        self.respawn(board)
+
+    def respawn(self, board):
+        """ Starts a new snake without body at a random free cell """
         self.tics_alive = 0
         self.score = 0
         self.direction = Direction.NORTH
         self.tics_to_starve = self.max_tics_to_starve
+        changed_cells = [(self.x, self.y)] + self.body_parts
         self.x, self.y = board.get_free_xy()
         self.body_parts = []
+        self.body_cells = set()
         self.size = 0
+        self.cause_of_death = None
+        changed_cells.append((self.x, self.y))
+        for x, y in changed_cells:
+            board.update_cell(x, y)
 
     def contains_body(self, x, y):
-        return (x, y) in self.body_parts
+        return (x, y) in self.body_cells
 
     def contains_head(self, x, y):
         return self.x == x and self.y == y
 
     def died(self, board):
+        return self.get_cause_of_death(board) is not None
+
+    def get_cause_of_death(self, board):
         if self.x < 0 or self.x >= board.width:
-            return True
+            return "out_of_bounds"
         if self.y < 0 or self.y >= board.height:
-            return True
+            return "out_of_bounds"
         if board.is_wall_at(self.x, self.y):
-            return True
-        if (self.x, self.y) in self.body_parts:
-            return True
-        return False
+            return "wall"
+        if (self.x, self.y) in self.body_cells:
+            return "body"
+        return None
@@ -0,0 +1,142 @@
+from random import randint
+
+from board import Board
+from gameobjects import GameObject
+
+
+class SparseGrid:
+    """
+    Two dimensional grid of game objects which can be indexed like the array returned by Board.get_copy(), so
+    grid[x][y] returns the GameObject at (x, y). Only the cells which are not empty are stored, so creating and copying
+    a grid takes time in the number of objects instead of the number of cells.
+    """
+
+    def __init__(self, width, height, cells=None):
+        """
+        :param cells: A dict with the game object of every cell that is not empty, by (x, y). The grid takes
+        ownership of the dict.
+        """
+        self.width = width
+        self.height = height
+        self.cells = cells if cells is not None else {}
+
+    def __getitem__(self, x):
+        if x < 0:
+            x += self.width
+        if not 0 <= x < self.width:
+            raise IndexError("board index out of range")
+        return SparseColumn(self, x)
+
+    def __len__(self):
+        return self.width
+
+    def __iter__(self):
+        for x in range(self.width):
+            yield SparseColumn(self, x)
+
+
+class SparseColumn:
+    """
+    A single column of a SparseGrid, see SparseGrid.
+    """
+
+    def __init__(self, grid, x):
+        self.grid = grid
+        self.x = x
+
+    def __getitem__(self, y):
+        if y < 0:
+            y += self.grid.height
+        if not 0 <= y < self.grid.height:
+            raise IndexError("board index out of range")
+        return self.grid.cells.get((self.x, y), GameObject.EMPTY)
+
+    def __setitem__(self, y, game_object):
+        if y < 0:
+            y += self.grid.height
+        if not 0 <= y < self.grid.height:
+            raise IndexError("board index out of range")
+        if game_object == GameObject.EMPTY:
+            self.grid.cells.pop((self.x, y), None)
+        else:
+            self.grid.cells[(self.x, y)] = game_object
+
+    def __len__(self):
+        return self.grid.height
+
+    def __iter__(self):
+        for y in range(self.grid.height):
+            yield self.grid.cells.get((self.x, y), GameObject.EMPTY)
+
+
+class SparseBoard(Board):
+    """
+    Board which only stores the walls and food, in a dict by position, and keeps no index of the empty cells. Building
+    the board, copying it and finding a free cell take time in the number of objects on the board instead of its area,
+    which makes very large boards with few objects possible. The copies given to the agent are SparseGrids.
+    """
+
+    # number of random cells tried by get_free_xy() before all cells are searched
+    max_random_tries = 1000
+
+    def create_grid(self):
+        return {}
+
+    def index_free_cells(self):
+        # empty cells are found by get_free_xy() instead
+        pass
+
+    def get_game_object_at(self, x, y):
+        if self.snake.contains_head(x, y):
+            return GameObject.SNAKE_HEAD
+        if self.snake.contains_body(x, y):
+            return GameObject.SNAKE_BODY
+        return self.board.get((x, y), GameObject.EMPTY)
+
+    def is_wall_at(self, x, y):
+        return self.board.get((x, y)) == GameObject.WALL
+
+    def is_food_at(self, x, y):
+        return self.board.get((x, y)) == GameObject.FOOD
+
+    def set_game_object_at(self, x, y, game_object):
+        was_wall = self.is_wall_at(x, y)
+        if game_object == GameObject.EMPTY:
+            self.board.pop((x, y), None)
+        else:
+            self.board[(x, y)] = game_object
+        self.update_object_indexes(x, y, was_wall, game_object)
+        self.update_cell(x, y)
+
+    def update_cell(self, x, y):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return
+        position = (x, y)
+        for tracker in self.change_trackers:
+            tracker.add(position)
+
+    def get_copy(self):
+        cells = dict(self.board)
+        for position in self.snake.body_parts:
+            cells[position] = GameObject.SNAKE_BODY
+        if 0 <= self.snake.x < self.width and 0 <= self.snake.y < self.height:
+            cells[(self.snake.x, self.snake.y)] = GameObject.SNAKE_HEAD
+        return SparseGrid(self.width, self.height, cells)
+
+    def get_copy_without_snake(self):
+        return SparseGrid(self.width, self.height, dict(self.board))
+
+    def get_free_xy(self):
+        """
+        Picks random cells until an empty one is found. Only when the board is (nearly) full, all cells are searched.
+        """
+        for i in range(self.max_random_tries):
+            x = randint(0, self.width - 1)
+            y = randint(0, self.height - 1)
+            if self.get_game_object_at(x, y) == GameObject.EMPTY:
+                return x, y
+        free_cells = [(x, y) for x in range(self.width) for y in range(self.height)
+                      if self.get_game_object_at(x, y) == GameObject.EMPTY]
+        if len(free_cells) == 0:
+            raise RuntimeError("Congratulations, you broke the game by filling each cell of the board!")
+        return free_cells[randint(0, len(free_cells) - 1)]
@@ -0,0 +1,98 @@
+import pytest
+
+import agent
+from engine import GameEngine
+from gameobjects import GameObject
+
+# seeds and number of turns of the games from which the positions right after eating are taken
+seeds = [0, 1]
+ticks = 1500
+
+
+class PostEatingRecorder:
+    """
+    Wraps an agent and saves the arguments of get_move right after the snake ate: the board as lists, the head and the
+    body. All other attributes are taken from the wrapped agent.
+    """
+
+    def __init__(self, wrapped):
+        self.wrapped = wrapped
+        self.previous_score = 0
+        self.scenarios = []
+
+    def get_move(self, board, score, turns_alive, turns_to_starve, direction, head_position, body_parts):
+        if score > self.previous_score:
+            copy = [[board[x][y] for y in range(len(board[0]))] for x in range(len(board))]
+            self.scenarios.append((copy, head_position, list(body_parts)))
+        self.previous_score = score
+        return self.wrapped.get_move(board, score, turns_alive, turns_to_starve, direction, head_position, body_parts)
+
+    def on_die(self, *args):
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self.wrapped, name)
+
+
+def follow_path(board, path, snake_body, growth):
+    """
+    Moves a snake along a path with the movement rules of Snake.update.
+
+    :return: True if the snake survives every step of the path.
+    """
+    body = list(snake_body)
+    size = len(body) + growth
+    for previous, (x, y) in zip(path, path[1:]):
+        body.insert(0, previous)
+        del body[size:]
+        if not (0 <= x < len(board) and 0 <= y < len(board[0])) or board[x][y] == GameObject.WALL or (x, y) in body:
+            return False
+        if board[x][y] == GameObject.FOOD:
+            size += 1
+    return True
+
+
+def check_path(planner, board, head_position, body_parts, growth):
+    """
+    Compares the path of the given planner with the path of the "list" planner, which simulates the body on copies of
+    the board. The path has to be found whenever the list planner finds one, the snake has to survive following it
+    and it may not be longer.
+    """
+    expected = agent.astar(head_position, board, 0, body_parts, growth=growth)
+    path = agent.planners[planner](head_position, board, 0, body_parts, growth=growth)
+    if expected is None:
+        return
+    assert path is not None
+    assert follow_path(board, path, body_parts, growth)
+    assert len(path) <= len(expected)
+
+
+@pytest.fixture(scope="module")
+def post_eating_scenarios():
+    scenarios = []
+    for seed in seeds:
+        engine = GameEngine(seed=seed)
+        recorder = PostEatingRecorder(engine.snake.agent)
+        engine.snake.agent = recorder
+        engine.run(ticks)
+        scenarios.extend(recorder.scenarios)
+    return scenarios
+
+
+@pytest.mark.parametrize("planner", ["heap", "ida"])
+def test_paths_after_eating(planner, post_eating_scenarios):
+    # right after eating, the tail stays in place for one more step
+    assert post_eating_scenarios
+    for board, head_position, body_parts in post_eating_scenarios:
+        check_path(planner, board, head_position, body_parts, 1)
+
+
+@pytest.mark.parametrize("planner", ["list", "heap", "ida"])
+def test_no_turn_around_into_single_body_part(planner):
+    board = [[GameObject.EMPTY for y in range(10)] for x in range(10)]
+    board[5][5] = GameObject.SNAKE_HEAD
+    board[5][6] = GameObject.SNAKE_BODY
+    board[5][7] = GameObject.FOOD
+    path = agent.planners[planner]((5, 5), board, 0, [(5, 6)])
+    assert path[1] != (5, 6)
+    check_path(planner, board, (5, 5), [(5, 6)], 0)
@@ -0,0 +1,133 @@
+import argparse
+from collections import namedtuple
+from multiprocessing import Pool, cpu_count
+
+import registry
+from benchmark import TimedAgent, percentile
+from engine import GameEngine
+from evaluator import summarize
+
+# agents played when no agents are given. The old agents are registered as well, but agentOLD.py does not finish its
+# search and agentOLD2.py raises an error, so they are only played when asked for
+default_agents = ["astar", "astar-list", "hamiltonian"]
+
+# One game of one agent in the tournament. expanded is None for agents that do not count their expanded nodes
+TournamentRow = namedtuple('TournamentRow', ['agent', 'seed', 'score', 'tics_alive', 'cause_of_death', 'moves',
+                                             'move_seconds', 'expanded'])
+
+
+def play_game(task):
+    """
+    Plays a single game of a single agent. This function is executed by the worker processes.
+
+    :param task: A tuple containing the name of the agent, the seed of the game, the maximum number of turns and a
+    dict with the settings passed to the GameEngine.
+
+    :return: The TournamentRow of the game. When the game did not end within the maximum number of turns, the cause
+    of death is "max_ticks". When the agent raised an error, the cause of death is the name of the error.
+    """
+    name, seed, max_ticks, settings = task
+    agent = registry.create_agent(name)
+    timed_agent = TimedAgent(agent)
+    engine = GameEngine(seed=seed, agent=timed_agent, **settings)
+    try:
+        results = engine.run_games(1, max_ticks)
+    except Exception as exception:
+        results = [(engine.snake.score, engine.snake.tics_alive, type(exception).__name__)]
+    if results:
+        score, tics_alive, cause_of_death = results[0]
+    else:
+        score, tics_alive, cause_of_death = engine.snake.score, engine.snake.tics_alive, "max_ticks"
+    search_stats = getattr(agent, "search_stats", None)
+    return TournamentRow(name, seed, score, tics_alive, cause_of_death, len(timed_agent.latencies),
+                         sum(timed_agent.latencies), search_stats["expanded"] if search_stats else None)
+
+
+def run_tournament(names, seeds, processes=None, max_ticks=10000, **settings):
+    """
+    Lets every agent play one game per seed. The engine is seeded before the board is built, so all agents start
+    on the same boards. The games of all agents are spread over a pool of processes.
+
+    :param names: The agents, see registry.create_agent().
+
+    :param seeds: An iterable of seeds.
+
+    :param processes: The number of worker processes, by default the number of cores.
+
+    :param max_ticks: Maximum number of turns per game, -1 for no limit.
+
+    :param settings: Settings passed to the GameEngine of each game (board_width, nr_walls, ...).
+
+    :return: A dict with the list of TournamentRows of every agent, ordered by seed.
+    """
+    seeds = list(seeds)
+    if processes is None:
+        processes = cpu_count()
+    tasks = [(name, seed, max_ticks, settings) for name in names for seed in seeds]
+    with Pool(processes) as pool:
+        rows = pool.map(play_game, tasks, 1)
+    return {name: [row for row in rows if row.agent == name] for name in names}
+
+
+def summarize_agent(rows):
+    """
+    :param rows: The TournamentRows of a single agent.
+
+    :return: The summary of evaluator.summarize() with the 10th, 50th and 90th percentile of the score, the mean
+    latency of a move in milliseconds and the mean number of expanded nodes per move (None if not counted).
+    """
+    summary = summarize(rows)
+    scores = sorted(row.score for row in rows)
+    moves = sum(row.moves for row in rows)
+    counted = [row for row in rows if row.expanded is not None]
+    summary.update({
+        "p10_score": percentile(scores, 10),
+        "median_score": percentile(scores, 50),
+        "p90_score": percentile(scores, 90),
+        "mean_move_ms": sum(row.move_seconds for row in rows) / moves * 1000 if moves else 0,
+        "expanded_per_move": sum(row.expanded for row in counted) / sum(row.moves for row in counted)
+        if counted and sum(row.moves for row in counted) else None
+    })
+    return summary
+
+
+def print_standings(results):
+    """
+    Prints the summaries of all agents side by side, ordered by mean score.
+    """
+    summaries = {name: summarize_agent(rows) for name, rows in results.items()}
+    print("{:<14} {:>6} {:>8} {:>6} {:>6} {:>6} {:>6} {:>10} {:>10}  {}".format(
+        "agent", "games", "mean", "p10", "p50", "p90", "max", "move ms", "expanded", "causes of death"))
+    for name, summary in sorted(summaries.items(), key=lambda item: -item[1]["mean_score"]):
+        expanded = summary["expanded_per_move"]
+        print("{:<14} {:>6} {:>8.2f} {:>6} {:>6} {:>6} {:>6} {:>10.3f} {:>10}  {}".format(
+            name, summary["games"], summary["mean_score"], summary["p10_score"], summary["median_score"],
+            summary["p90_score"], summary["max_score"], summary["mean_move_ms"],
+            "-" if expanded is None else "{:.1f}".format(expanded), summary["causes_of_death"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Let agents play the same seeded games and compare the results.")
+    parser.add_argument("--agents", nargs="+", default=default_agents,
+                        help="names of registered agents ({}) or module:Class".format(", ".join(sorted(registry.agents))))
+    parser.add_argument("--games", type=int, default=20, help="number of games per agent")
+    parser.add_argument("--first-seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--processes", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--max-ticks", type=int, default=10000, help="maximum number of turns per game")
+    parser.add_argument("--board-width", type=int, default=25)
+    parser.add_argument("--board-height", type=int, default=25)
+    parser.add_argument("--food", type=int, default=1, help="maximum number of food blocks")
+    parser.add_argument("--walls", type=int, default=1, help="number of random walls when using --random-walls")
+    parser.add_argument("--random-walls", action="store_true", help="spawn random walls instead of the test config")
+    parser.add_argument("--starvation-tics", type=int, default=-1)
+    args = parser.parse_args()
+
+    results = run_tournament(args.agents, range(args.first_seed, args.first_seed + args.games), args.processes,
+                             args.max_ticks, board_width=args.board_width, board_height=args.board_height,
+                             max_nr_food=args.food, nr_walls=args.walls, test_config=not args.random_walls,
+                             starvation_tics=args.starvation_tics)
+    print_standings(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import numpy as np
+
+from gameobjects import GameObject
+from move import Direction, Move
+
+WALL = GameObject.WALL.value
+FOOD = GameObject.FOOD.value
+EMPTY = GameObject.EMPTY.value
+SNAKE_HEAD = GameObject.SNAKE_HEAD.value
+SNAKE_BODY = GameObject.SNAKE_BODY.value
+
+# the values of the moves a snake can make, see step()
+valid_moves = [move.value for move in Move]
+# stands in for anything in a list of moves that is neither a Move nor an integer
+invalid_move = 2
+
+# the x and y manipulation of every direction, indexed by the value of the direction
+direction_deltas = np.array([Direction(value).get_xy_manipulation() for value in range(4)], dtype=np.int32)
+
+
+class VecSnakeEnv:
+    """
+    Steps many independent games at once. All boards, heads, directions and bodies are stored in batched NumPy arrays
+    and a single call to step() advances every game, following the same rules as Snake.update and Snake.died. Games in
+    which the snake died are reset automatically.
+
+    The body of every snake is kept in a ring buffer of flat cell indexes (x * board_height + y), where body_start
+    points at the body part directly following the head.
+    """
+
+    def __init__(self, n_envs, board_width=25, board_height=25, max_nr_food=1, nr_walls=1, test_config=True,
+                 starvation_tics=-1, should_grow=True, seed=None):
+        """
+        :param n_envs: The number of games to run.
+
+        :param should_grow: Indicates whether the snakes grow when eating, see Agent.should_grow_on_food_collision.
+
+        :param seed: Seed for the random number generator of the environments.
+
+        The other parameters are equal to the game settings in main.py.
+        """
+        self.n_envs = n_envs
+        self.width = board_width
+        self.height = board_height
+        self.max_nr_food = max_nr_food
+        self.max_tics_to_starve = starvation_tics
+        self.should_grow = should_grow
+        self.rng = np.random.default_rng(seed)
+
+        capacity = board_width * board_height
+        self.grid = np.full((n_envs, board_width, board_height), EMPTY, dtype=np.int8)
+        # cells occupied by the body of the snake (not the head)
+        self.occupied = np.zeros((n_envs, board_width, board_height), dtype=bool)
+        self.body = np.zeros((n_envs, capacity), dtype=np.int32)
+        self.body_start = np.zeros(n_envs, dtype=np.int64)
+        self.body_length = np.zeros(n_envs, dtype=np.int64)
+        self.size = np.zeros(n_envs, dtype=np.int64)
+        self.head_x = np.zeros(n_envs, dtype=np.int64)
+        self.head_y = np.zeros(n_envs, dtype=np.int64)
+        self.direction = np.full(n_envs, Direction.NORTH.value, dtype=np.int64)
+        self.score = np.zeros(n_envs, dtype=np.int64)
+        self.tics_alive = np.zeros(n_envs, dtype=np.int64)
+        self.tics_to_starve = np.full(n_envs, starvation_tics, dtype=np.int64)
+
+        wall_pos_not_allowed = [(0, 1), (1, 0), (board_width - 2, 0), (board_width - 1, 1),
+                                (board_width - 1, board_height - 2), (board_width - 2, board_height - 1),
+                                (0, board_height - 2), (1, board_height - 1)]
+        for env in range(n_envs):
+            if not test_config:
+                for i in range(nr_walls):
+                    x, y = self.get_free_xy(env, False)
+                    while (x, y) in wall_pos_not_allowed:
+                        x, y = self.get_free_xy(env, False)
+                    self.grid[env, x, y] = WALL
+            else:
+                for x, y in [(7, 5), (15, 8)]:
+                    if x < board_width and y < board_height:
+                        self.grid[env, x, y] = WALL
+            self.head_x[env], self.head_y[env] = self.get_free_xy(env, False)
+            for i in range(max_nr_food):
+                x, y = self.get_free_xy(env)
+                self.grid[env, x, y] = FOOD
+
+    def get_free_xy(self, env, exclude_head=True):
+        """
+        :param env: The index of the game.
+
+        :param exclude_head: Indicates whether the cell of the head counts as occupied.
+
+        :return: A random empty position on the board of the given game.
+        """
+        free = (self.grid[env] == EMPTY) & ~self.occupied[env]
+        if exclude_head:
+            free[self.head_x[env], self.head_y[env]] = False
+        available = np.flatnonzero(free)
+        if len(available) == 0:
+            raise RuntimeError("Congratulations, you broke the game by filling each cell of the board!")
+        position = available[self.rng.integers(len(available))]
+        return position // self.height, position % self.height
+
+    def step(self, moves):
+        """
+        Advances all games a single turn.
+
+        :param moves: An array of n_envs moves, either Move members or their values (-1 for left, 0 for straight and 1
+        for right). Like an invalid return value of get_move in Snake.update, any other value kills the snake without
+        moving it.
+
+        :return: A tuple (score, tics_alive, done) of arrays. done is True for every game in which the snake died this
+        turn, for these games score and tics_alive hold the values of the finished game and the game has already been
+        reset.
+        """
+        moves = np.asarray(moves)
+        if moves.dtype == object:
+            moves = np.array([move.value if isinstance(move, Move) else move if isinstance(move, (int, np.integer))
+                              else invalid_move for move in moves])
+        invalid = ~np.isin(moves, valid_moves)
+        moves = np.where(invalid, 0, moves).astype(np.int64)
+        capacity = self.width * self.height
+
+        # starving snakes and snakes given an invalid move die before moving
+        starved = (self.tics_to_starve == 0) | invalid
+        movers = np.flatnonzero(~starved)
+
+        # the old head becomes the first body part
+        start = (self.body_start[movers] - 1) % capacity
+        self.body[movers, start] = self.head_x[movers] * self.height + self.head_y[movers]
+        self.occupied[movers, self.head_x[movers], self.head_y[movers]] = True
+        self.body_start[movers] = start
+        self.body_length[movers] += 1
+
+        # remove the tail when the body is longer than the size of the snake
+        shrinking = movers[self.body_length[movers] > self.size[movers]]
+        tail = self.body[shrinking, (self.body_start[shrinking] + self.body_length[shrinking] - 1) % capacity]
+        self.occupied[shrinking, tail // self.height, tail % self.height] = False
+        self.body_length[shrinking] -= 1
+
+        # move the head
+        self.direction[movers] = (self.direction[movers] + moves[movers]) % 4
+        self.head_x[movers] += direction_deltas[self.direction[movers], 0]
+        self.head_y[movers] += direction_deltas[self.direction[movers], 1]
+
+        inside = (self.head_x >= 0) & (self.head_x < self.width) & (self.head_y >= 0) & (self.head_y < self.height)
+        x = np.clip(self.head_x, 0, self.width - 1)
+        y = np.clip(self.head_y, 0, self.height - 1)
+        envs = np.arange(self.n_envs)
+        collided = (self.grid[envs, x, y] == WALL) | self.occupied[envs, x, y]
+        done = starved | ~inside | collided
+        alive = ~done
+
+        # eat the food
+        eating = np.flatnonzero(alive & (self.grid[envs, x, y] == FOOD))
+        if self.should_grow:
+            self.size[eating] += 1
+        self.score[eating] += 1
+        self.grid[eating, x[eating], y[eating]] = EMPTY
+        for env in eating:
+            food_x, food_y = self.get_free_xy(env)
+            self.grid[env, food_x, food_y] = FOOD
+        if self.max_tics_to_starve != -1:
+            self.tics_to_starve[eating] = self.max_tics_to_starve + 1
+            self.tics_to_starve[alive] -= 1
+        self.tics_alive[alive] += 1
+
+        score = self.score.copy()
+        tics_alive = self.tics_alive.copy()
+        self.reset(np.flatnonzero(done))
+        return score, tics_alive, done
+
+    def reset(self, envs):
+        """
+        Resets the snakes of the given games, the walls and food stay in place.
+
+        :param envs: An array with the indexes of the games to reset.
+        """
+        self.occupied[envs] = False
+        self.body_length[envs] = 0
+        self.size[envs] = 0
+        self.score[envs] = 0
+        self.tics_alive[envs] = 0
+        self.direction[envs] = Direction.NORTH.value
+        self.tics_to_starve[envs] = self.max_tics_to_starve
+        for env in envs:
+            self.head_x[env], self.head_y[env] = self.get_free_xy(env, False)
+
+    def get_boards(self):
+        """
+        :return: An int8 array of shape (n_envs, board_width, board_height) with the game object values of all boards,
+        including the snakes.
+        """
+        boards = self.grid.copy()
+        boards[self.occupied] = SNAKE_BODY
+        boards[np.arange(self.n_envs), self.head_x, self.head_y] = SNAKE_HEAD
+        return boards